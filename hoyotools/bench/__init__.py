@@ -0,0 +1 @@
+"""Local HoYoLAB stub and load-test harness, see ``python -m hoyotools.bench --help``."""
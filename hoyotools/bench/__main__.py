@@ -0,0 +1,210 @@
+"""Load-test the HoyoTools claim pipeline against a local HoYoLAB stub.
+
+Run from the repository root, with Red-DiscordBot and genshin.py installed:
+
+    python -m hoyotools.bench --users 500 --cookies 2 --runs 3
+
+The cog drives real genshin.py clients, with genshin.py's HoYoLAB routes
+pointed at the stub, so nothing is sent to HoYoLAB or Discord. Config is stored as JSON in a
+temporary directory that is removed afterwards.
+"""
+
+import argparse
+import asyncio
+import secrets
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import aiohttp
+
+from ..utils import ClientPool, CooldownScheduler
+from ..vars import CLIENT_IDLE_TTL, CLIENT_POOL_SIZE
+from .stub import StubServer, cookie_for
+
+
+class StubBot:
+    """Just enough of Red for the cog: every user exists and is reachable."""
+
+    def get_user(self, user_id: int):
+        return SimpleNamespace(id=user_id)
+
+    async def wait_until_ready(self):
+        return None
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def request_trace(latencies: list[float], connections: list[float]):
+    """Record the latency of every request, and when each new connection is opened."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.start = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        latencies.append(time.perf_counter() - ctx.start)
+
+    async def on_connection_create_end(session, ctx, params):
+        connections.append(time.perf_counter())
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    return trace
+
+
+def setup_storage(path: str):
+    """Point Red's data manager at ``path`` with JSON storage, which needs no setup."""
+    from redbot.core import data_manager
+
+    data_manager.basic_config = data_manager.basic_config_default.copy()
+    data_manager.basic_config.update(
+        DATA_PATH=path, STORAGE_TYPE="JSON", STORAGE_DETAILS={}
+    )
+
+
+async def create_cog(args, server: StubServer, trace: aiohttp.TraceConfig):
+    from ..hoyotools import HoyoTools
+
+    cog = HoyoTools(StubBot())
+
+    def make_client(cookie: str):
+        # The cog's own genshin.Client, with its sessions traced
+        client = cog._make_client(cookie)
+        create_session = client.cookie_manager.create_session
+        client.cookie_manager.create_session = lambda **kwargs: create_session(
+            trace_configs=[trace], **kwargs
+        )
+        return client
+
+    cog._clients = ClientPool(make_client, CLIENT_POOL_SIZE, CLIENT_IDLE_TTL)
+    cog._redeem_scheduler = CooldownScheduler(args.redeem_cooldown)
+    cog._limiter.set_rate(args.rate)
+    await cog.config.max_concurrency.set(args.concurrency)
+    await cog._load_game_limits()
+    await cog._load_vault()
+
+    dead_every = round(1 / args.dead) if args.dead else 0
+    users = {}
+    for user_id in range(1, args.users + 1):
+        cookies = []
+        for idx in range(args.cookies):
+            ltuid = user_id * args.cookies + idx
+            if dead_every and ltuid % dead_every == 0:
+                server.dead.add(ltuid)
+            cookies.append(cookie_for(ltuid, secrets.token_hex(16)))
+        users[user_id] = cookies
+
+    await asyncio.gather(
+        *(
+            cog.config.user_from_id(user_id).set(
+                {
+                    "vault": [cog._vault.seal(cookie) for cookie in cookies],
+                    "auto_login": True,
+                    "login_notify": False,
+                    "auto_redeem": True,
+                }
+            )
+            for user_id, cookies in users.items()
+        )
+    )
+    await cog._load_roster()
+    return cog
+
+
+async def main(args):
+    tracemalloc.start()
+    server = StubServer(args.latency, args.jitter, args.server_rate, args.error_rate)
+    await server.start()
+    latencies: list[float] = []
+    connections: list[float] = []
+    trace = request_trace(latencies, connections)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_storage(tmp)
+        cog = await create_cog(args, server, trace)
+        try:
+            total = args.users * args.cookies
+            print(
+                f"{args.users} users × {args.cookies} cookies, "
+                f"concurrency {args.concurrency}, client rate {args.rate}/s"
+            )
+
+            for run in range(1, args.runs + 1):
+                server.new_day()
+                latencies.clear()
+                connections.clear()
+                start = time.perf_counter()
+                stats = await cog._perform_auto_login(resume=False)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"run {run}: {elapsed:.2f}s, {total / elapsed:.1f} cookies/s, "
+                    f"{len(latencies)} requests over {len(connections)} new connections, "
+                    f"p50 {percentile(latencies, 0.5) * 1000:.1f}ms, "
+                    f"p99 {percentile(latencies, 0.99) * 1000:.1f}ms, "
+                    f"{stats['success']} claimed, {stats['errors']} errors, "
+                    f"{stats['skipped']} skipped, {stats['quarantined']} quarantined"
+                )
+
+            if args.codes:
+                codes = [f"BENCH{i:04d}" for i in range(args.codes)]
+                latencies.clear()
+                start = time.perf_counter()
+                stats = await cog._fan_out_codes(codes)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"redeem: {elapsed:.2f}s, "
+                    f"{stats['redeemed'] / elapsed:.1f} redemptions/s, "
+                    f"p50 {percentile(latencies, 0.5) * 1000:.1f}ms, "
+                    f"p99 {percentile(latencies, 0.99) * 1000:.1f}ms, "
+                    f"{stats['redeemed']} redeemed, {stats['failed']} failed"
+                )
+        finally:
+            # Closes the shared connector before the stub goes away
+            await cog.cog_unload()
+            await server.stop()
+
+    current, peak = tracemalloc.get_traced_memory()
+    print(
+        f"memory: {current / 2**20:.1f} MiB current, {peak / 2**20:.1f} MiB peak, "
+        f"{server.requests} stub requests"
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m hoyotools.bench")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--cookies", type=int, default=1, help="cookies per user")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--rate", type=float, default=1000.0, help="client-side requests per second"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="stub response time in seconds"
+    )
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument(
+        "--server-rate",
+        type=float,
+        default=None,
+        help="requests per second before the stub answers with retcode -110",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="share of injected errors"
+    )
+    parser.add_argument("--dead", type=float, default=0.0, help="share of dead cookies")
+    parser.add_argument("--codes", type=int, default=0, help="codes to fan out")
+    parser.add_argument("--redeem-cooldown", type=float, default=0.0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
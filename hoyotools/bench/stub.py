@@ -0,0 +1,223 @@
+import asyncio
+import random
+import time
+from collections import Counter, deque
+from functools import partial
+from typing import Optional
+
+import genshin
+import yarl
+from aiohttp import web
+from genshin.client import routes
+
+OVERSEAS = genshin.Region.OVERSEAS
+
+# genshin.py routes the cog ends up calling, pointed at the stub while it runs
+ROUTES = (
+    routes.TAKUMI_URL,
+    routes.GET_USER_REGION_URL,
+    routes.REWARD_URL,
+    routes.CODE_URL,
+)
+
+# game_biz -> (UID base, server) of the account every cookie owns per game.
+# UIDs fall in the ranges genshin.py recognizes the server of
+ACCOUNTS = {
+    "hk4e_global": (800000000, "os_asia"),
+    "bh3_global": (10000000, "overseas01"),
+    "hkrpg_global": (800000000, "prod_official_asia"),
+    "nap_global": (1700000000, "prod_gf_sg"),
+    "nxx_global": (100000000, "glb_prod_wd01"),
+}
+
+# Daily rewards of a month, as listed by the "home" endpoint
+AWARDS = [{"name": "Primogem", "cnt": 20, "icon": ""}] * 31
+
+
+def cookie_for(ltuid: int, token: str) -> str:
+    """Build a cookie string the stub recognizes the account of.
+
+    Like a real HoYoLAB cookie it carries a cookie_token, which genshin.py
+    requires before redeeming codes.
+    """
+    return (
+        f"ltuid_v2={ltuid}; ltoken_v2=v2_{token}; "
+        f"account_id_v2={ltuid}; cookie_token_v2=v2_{token}"
+    )
+
+
+class StubServer:
+    """A local stand-in for the HoYoLAB endpoints the cog uses.
+
+    The stub serves the same paths and response shapes as HoYoLAB, and while
+    it runs genshin.py's routes point at it, so real genshin.Client instances
+    talk to it unchanged. Accounts are identified by the ``ltuid_v2`` cookie;
+    every account owns one game account per entry in ACCOUNTS.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        rate_limit: Optional[float] = None,
+        error_rate: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.error_rate = error_rate
+        # ltuids answered with "Please login"
+        self.dead: set[int] = set()
+        self.claimed: set[tuple[int, genshin.Game]] = set()
+        self.sign_days: Counter[tuple[int, genshin.Game]] = Counter()
+        self.redeemed: set[tuple[str, str]] = set()
+        self.requests = 0
+        self._recent: deque[float] = deque()
+        self._runner: Optional[web.AppRunner] = None
+        self._saved_routes: list[tuple[routes.BaseRoute, dict]] = []
+        self.url = ""
+
+        self.app = web.Application()
+        self.app.router.add_get(
+            routes.TAKUMI_URL.get_url(OVERSEAS)
+            .join(yarl.URL("binding/api/getUserGameRolesByCookie"))
+            .path,
+            self._accounts,
+        )
+        self.app.router.add_get(
+            routes.GET_USER_REGION_URL.get_url().path, self._accounts
+        )
+        for game, url in routes.REWARD_URL.urls[OVERSEAS].items():
+            self.app.router.add_post(f"{url.path}/sign", partial(self._sign, game))
+            self.app.router.add_get(f"{url.path}/info", partial(self._info, game))
+            self.app.router.add_get(f"{url.path}/home", self._home)
+        for path in {url.path for url in routes.CODE_URL.urls[OVERSEAS].values()}:
+            self.app.router.add_route("*", path, self._redeem)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{port}"
+        self._point_routes(host, port)
+
+    async def stop(self):
+        for route, saved in self._saved_routes:
+            vars(route).update(saved)
+        self._saved_routes.clear()
+        if self._runner:
+            await self._runner.cleanup()
+
+    def _point_routes(self, host: str, port: int):
+        """Point the overseas URLs of ROUTES at the stub, keeping paths and queries."""
+
+        def rebase(url: yarl.URL) -> yarl.URL:
+            return url.with_scheme("http").with_host(host).with_port(port)
+
+        for route in ROUTES:
+            self._saved_routes.append((route, vars(route).copy()))
+            if isinstance(route, routes.Route):
+                route.url = rebase(route.url)
+            elif isinstance(route, routes.GameRoute):
+                urls = {g: rebase(u) for g, u in route.urls[OVERSEAS].items()}
+                route.urls = {**route.urls, OVERSEAS: urls}
+            else:
+                route.urls = {**route.urls, OVERSEAS: rebase(route.urls[OVERSEAS])}
+
+    def new_day(self):
+        """Forget today's claims so the next run claims everything again."""
+        self.claimed.clear()
+
+    async def _envelope(self, request: web.Request) -> tuple[Optional[dict], int]:
+        """Apply latency, rate limiting, login checks and error injection.
+
+        Returns the error response to send, if any, and the account's ltuid.
+        """
+        self.requests += 1
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        await asyncio.sleep(max(0.0, delay))
+
+        if self.rate_limit:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 1:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate_limit:
+                return {"retcode": -110, "message": "Visits too frequently"}, 0
+            self._recent.append(now)
+
+        ltuid = request.cookies.get("ltuid_v2", "")
+        if not ltuid.isdigit() or int(ltuid) in self.dead:
+            return {"retcode": -100, "message": "Please login"}, 0
+        if self.error_rate and random.random() < self.error_rate:
+            return {"retcode": -1, "message": "Injected stub error"}, 0
+        return None, int(ltuid)
+
+    @staticmethod
+    def _ok(data: Optional[dict] = None, message: str = "OK") -> web.Response:
+        return web.json_response({"retcode": 0, "message": message, "data": data})
+
+    async def _accounts(self, request: web.Request) -> web.Response:
+        error, ltuid = await self._envelope(request)
+        if error:
+            return web.json_response(error)
+        biz = request.query.get("game_biz")
+        accounts = [
+            {
+                "game_biz": game_biz,
+                "game_uid": str(base + ltuid),
+                "region": server,
+                "region_name": server,
+                "level": 60,
+                "nickname": f"Bench{ltuid}",
+            }
+            for game_biz, (base, server) in ACCOUNTS.items()
+            if biz in (None, game_biz)
+        ]
+        return self._ok({"list": accounts})
+
+    async def _sign(self, game: genshin.Game, request: web.Request) -> web.Response:
+        error, ltuid = await self._envelope(request)
+        if error:
+            return web.json_response(error)
+        if (ltuid, game) in self.claimed:
+            return web.json_response(
+                {"retcode": -5003, "message": "Traveler, you've already checked in"}
+            )
+        self.claimed.add((ltuid, game))
+        self.sign_days[ltuid, game] += 1
+        return self._ok(
+            {"code": "", "risk_code": 0, "gt": "", "challenge": "", "success": 0}
+        )
+
+    async def _info(self, game: genshin.Game, request: web.Request) -> web.Response:
+        error, ltuid = await self._envelope(request)
+        if error:
+            return web.json_response(error)
+        return self._ok(
+            {
+                "is_sign": (ltuid, game) in self.claimed,
+                "total_sign_day": self.sign_days[ltuid, game],
+            }
+        )
+
+    async def _home(self, request: web.Request) -> web.Response:
+        error, _ = await self._envelope(request)
+        if error:
+            return web.json_response(error)
+        return self._ok({"month": 1, "awards": AWARDS})
+
+    async def _redeem(self, request: web.Request) -> web.Response:
+        error, _ = await self._envelope(request)
+        if error:
+            return web.json_response(error)
+        # Star Rail and ZZZ post the code as JSON, the other games pass it in the query
+        params = await request.json() if request.method == "POST" else request.query
+        key = (str(params["uid"]), params["cdkey"])
+        if key in self.redeemed:
+            return web.json_response(
+                {"retcode": -2017, "message": "Redemption code has been used"}
+            )
+        self.redeemed.add(key)
+        return self._ok(message="Redeemed successfully")
@@ -1,18 +1,78 @@
-from .vars import SUPPORTED_GAMES, GAME_NAMES, FAIL_ICONS, SUCCESS_ICONS
-from typing import Literal, Optional, Union
+from .vars import (
+    GAME_ADAPTERS,
+    SUPPORTED_GAMES,
+    REDEEM_GAMES,
+    GAME_NAMES,
+    FAIL_ICONS,
+    SUCCESS_ICONS,
+    CLIENT_POOL_SIZE,
+    CLIENT_IDLE_TTL,
+    HTTP_CONNECTION_LIMIT,
+    ACCOUNT_CACHE_TTL,
+    CHECKPOINT_BATCH,
+    RATE_LIMIT_RETCODES,
+    RATE_LIMIT_COOLDOWN,
+    DM_INTERVAL,
+    DM_QUEUE_SIZE,
+    EMBED_MAX_FIELDS,
+    REDEEM_COOLDOWN,
+    LIST_LOOKUP_TIMEOUT,
+    PROGRESS_INTERVAL,
+    METRIC_BUCKETS,
+    HEALTH_DEAD_AFTER,
+    HEALTH_RECHECK_INTERVAL,
+    HEALTH_RECHECK_BATCH,
+    DEFERRED_RETRY_DELAYS,
+    DEFERRED_RETRY_ATTEMPTS,
+)
+from .results import (
+    QUARANTINED,
+    ClaimResult,
+    ClaimStatus,
+    CookieClaim,
+    RedeemResult,
+    RedeemStatus,
+)
+from .vault import CookieVault
+from .utils import (
+    AccountInfo,
+    ClientPool,
+    CooldownScheduler,
+    MetricsRegistry,
+    RateLimiter,
+    backoff_delay,
+    classify_claim_error,
+    classify_redeem_error,
+    cookie_hash,
+    shard_of,
+)
+from typing import (
+    Awaitable,
+    Callable,
+    Collection,
+    Literal,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 from redbot.core import commands
 from discord.ext import tasks
 from redbot.core.bot import Red
 from redbot.core.config import Config
+from redbot.core.data_manager import cog_data_path
 from .views import CookieModal, CookieManageView
 
 import asyncio
-from datetime import datetime
+from contextlib import asynccontextmanager
+from pathlib import Path
+from datetime import datetime, timedelta
 
 import logging
 import random
+import time
 
+import aiohttp
 import genshin
 from discord import Embed, User, TextChannel, Forbidden
 from discord.utils import utcnow
@@ -22,6 +82,8 @@ log = logging.getLogger("red.raidensakura.hoyotools")
 
 RequestType = Literal["discord_deleted_user", "owner", "user", "user_strict"]
 
+T = TypeVar("T")
+
 
 class HoyoTools(commands.Cog):
     """
@@ -40,22 +102,85 @@ class HoyoTools(commands.Cog):
             auto_login=False,
             login_notify=True,
             redeem_codes=[],
+            auto_redeem=False,
+            vault=[],
         )
         self.config.register_global(
             auto_login_channel=None,
             auto_login=False,
             login_time=None,
             last_run=None,
+            max_concurrency=10,
+            game_limits={},
+            account_cache={},
+            shard_count=1,
+            shard_window=60,
+            shard_state={},
+            checkpoint={},
+            rate_limit=5.0,
+            code_games={},
+            codes={},
+            roster=None,
+            cookie_health={},
+            vault_cache_size=CLIENT_POOL_SIZE,
+            vault_idle_ttl=CLIENT_IDLE_TTL,
+            vault_wipe=False,
+            retry_queue={},
         )
         self._task_lock = asyncio.Lock()
+        self._game_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._limiter = RateLimiter(5.0)
+        self._metrics = MetricsRegistry(METRIC_BUCKETS)
+        self._redeem_scheduler = CooldownScheduler(REDEEM_COOLDOWN)
+        self._code_games: dict[str, str] = {}
+        self._codes: dict[str, dict] = {}
+        self._roster: dict[str, dict] = {}
+        self._health: dict[str, dict] = {}
+        self._vault: Optional[CookieVault] = None
+        self._retries: dict[str, dict] = {}
+        self._background: set[asyncio.Task] = set()
+        self._dm_queue: asyncio.Queue = asyncio.Queue(maxsize=DM_QUEUE_SIZE)
+        self._dm_stats = {"sent": 0, "forbidden": 0, "dropped": 0, "failed": 0}
+        self._clients = ClientPool(self._make_client, CLIENT_POOL_SIZE, CLIENT_IDLE_TTL)
+        self._connector: Optional[aiohttp.TCPConnector] = None
+        self._account_cache: dict[str, dict] = {}
+        self._account_cache_dirty = False
+        self._checkpoint: set[str] = set()
+        self._checkpoint_date: Optional[str] = None
+        self._checkpoint_pending = 0
 
     async def cog_load(self):
         await super().cog_load()
+        await self._load_game_limits()
+        self._limiter.set_rate(await self.config.rate_limit())
+        self._account_cache = await self.config.account_cache()
+        self._code_games = await self.config.code_games()
+        self._codes = await self.config.codes()
+        await self._load_vault()
+        await self._migrate_cookies()
+        await self._load_roster()
+        self._health = await self.config.cookie_health()
+        self._retries = await self.config.retry_queue()
         self.daily_task.start()
+        self.dm_task.start()
+        self.health_task.start()
+        self.retry_task.start()
 
     async def cog_unload(self):
         await super().cog_unload()
         self.daily_task.cancel()
+        self.dm_task.cancel()
+        self.health_task.cancel()
+        self.retry_task.cancel()
+        for task in self._background:
+            task.cancel()
+        self._clients.clear()
+        if self._connector:
+            await self._connector.close()
+        if self._vault:
+            self._vault.purge()
+        await self._flush_checkpoint()
+        await self._flush_account_cache()
 
     async def red_delete_data_for_user(
         self, *, requester: RequestType, user_id: int
@@ -65,154 +190,484 @@ class HoyoTools(commands.Cog):
         This includes authentication cookies, saved redemption codes, and the
         per-user auto-login and notification preferences.
         """
+        for cookie in await self.get_cookies(user_id):
+            self.forget_cookie(cookie)
+            await self._set_cookie_health(cookie, None)
+        await self._flush_account_cache()
         await self.config.user_from_id(user_id).clear()
+        await self.sync_roster(user_id)
+
+    async def _load_vault(self):
+        """Open the cookie vault with the bot-local key and apply the owner's cache policy."""
+        key = CookieVault.load_key(cog_data_path(self) / "vault.key")
+        size = await self.config.vault_cache_size()
+        ttl = await self.config.vault_idle_ttl()
+        self._vault = CookieVault(key, size, ttl)
+        self._clients.max_size = size
+        self._clients.idle_ttl = ttl
+
+    async def _migrate_cookies(self):
+        """Move plaintext cookies saved by older versions into the vault."""
+        for user_id, udata in (await self.config.all_users()).items():
+            if not udata.get("cookies"):
+                continue
+            cookies = await self.get_cookies(user_id)
+            cookies += [c for c in udata["cookies"] if c not in cookies]
+            await self.set_cookies(user_id, cookies)
+            await self.config.user_from_id(user_id).cookies.clear()
+
+    async def get_cookies(self, user_id: int) -> list[str]:
+        """Get a user's cookies, decrypting only those not already in memory."""
+        return self._vault.open_all(await self.config.user_from_id(user_id).vault())
+
+    async def set_cookies(self, user_id: int, cookies: list[str]):
+        """Save a user's cookies encrypted, reusing the sealed entry of unchanged ones.
+
+        Entries that no longer decrypt are never part of ``cookies`` (see
+        get_cookies), so they are kept as they are rather than dropped.
+        """
+        entries = await self.config.user_from_id(user_id).vault()
+        sealed = {e["id"]: e for e in entries}
+        vault = [sealed.get(cookie_hash(c)) or self._vault.seal(c) for c in cookies]
+        kept = {e["id"] for e in vault}
+        vault += [
+            e for e in entries if e["id"] not in kept and not self._vault.can_open(e)
+        ]
+        await self.config.user_from_id(user_id).vault.set(vault)
+
+    async def _load_roster(self):
+        """Load the auto login roster, building it from user data the first time."""
+        roster = await self.config.roster()
+        if roster is None:
+            roster = {}
+            for user_id, udata in (await self.config.all_users()).items():
+                entry = self._roster_entry(udata)
+                if entry:
+                    roster[str(user_id)] = entry
+            await self.config.roster.set(roster)
+        self._roster = roster
+
+    @staticmethod
+    def _roster_entry(udata: dict) -> Optional[dict]:
+        cookies = udata.get("vault", []) or []
+        if not udata.get("auto_login") or not cookies:
+            return None
+        return {"cookies": len(cookies), "notify": udata.get("login_notify", True)}
+
+    async def sync_roster(self, user_id: int):
+        """Update a user's roster entry after their cookies or login settings change."""
+        entry = self._roster_entry(await self.config.user_from_id(user_id).all())
+        key = str(user_id)
+        if entry is None:
+            if self._roster.pop(key, None) is not None:
+                await self.config.clear_raw("roster", key)
+        elif self._roster.get(key) != entry:
+            self._roster[key] = entry
+            await self.config.set_raw("roster", key, value=entry)
 
     def _make_client(self, cookie: str):
         client = genshin.Client(lang="en-us")
         client.set_cookies(cookie)
+
+        # genshin.py opens a new session (and so new connections) per request;
+        # give its sessions the shared connector so connections and TLS
+        # handshakes are reused across requests and clients. Proxies are passed
+        # per request by genshin.py, so the session does not need one
+        def create_session(**kwargs) -> aiohttp.ClientSession:
+            if self._connector is None or self._connector.closed:
+                self._connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT)
+            return aiohttp.ClientSession(
+                cookie_jar=aiohttp.DummyCookieJar(),
+                connector=self._connector,
+                connector_owner=False,
+                **kwargs,
+            )
+
+        client.cookie_manager.create_session = create_session
         return client
 
-    async def claim_daily(self, cookie: str):
-        client = self._make_client(cookie)
-        results = {}
-        errors = []
+    def get_client(self, cookie: str) -> genshin.Client:
+        """Get a pooled client for a cookie, creating one if needed."""
+        return self._clients.get(cookie)
+
+    def forget_cookie(self, cookie: str):
+        """Drop everything cached for a cookie, e.g. once it is removed or invalid."""
+        self._clients.discard(cookie)
+        self._vault.forget(cookie_hash(cookie))
+        if self._account_cache.pop(cookie_hash(cookie), None) is not None:
+            self._account_cache_dirty = True
+
+    async def get_accounts(self, cookie: str) -> list[AccountInfo]:
+        """Get the game accounts bound to a cookie, cached for ACCOUNT_CACHE_TTL.
+
+        Raises genshin.InvalidCookies (after evicting the cookie) like get_game_accounts.
+        """
+        key = cookie_hash(cookie)
+        entry = self._account_cache.get(key)
+        if entry and time.time() - entry["fetched"] < ACCOUNT_CACHE_TTL:
+            return [AccountInfo(*a) for a in entry["accounts"]]
 
         try:
-            accounts = await client.get_game_accounts()
+            accounts = await self._api(self.get_client(cookie).get_game_accounts)
         except genshin.InvalidCookies:
-            return {"errors": ["Invalid cookie"]}
+            self.forget_cookie(cookie)
+            await self.record_cookie_health(cookie, False)
+            raise
+
+        result = [AccountInfo(a.game_biz, a.uid) for a in accounts]
+        self._account_cache[key] = {
+            "fetched": time.time(),
+            "accounts": [list(a) for a in result],
+        }
+        self._account_cache_dirty = True
+        return result
 
-        game_accounts = {a.game_biz: a for a in accounts}
+    def cookie_state(self, cookie: str) -> str:
+        """Return "healthy", "suspect" or "dead" for a cookie."""
+        entry = self._health.get(cookie_hash(cookie))
+        return entry["state"] if entry else "healthy"
 
-        for game, account in game_accounts.items():
-            if game not in SUPPORTED_GAMES:
-                continue
+    async def record_cookie_health(self, cookie: str, valid: bool):
+        """Move a cookie through the health states after HoYoLAB accepted or rejected it.
 
-            uid = str(account.uid)
-            censored = "xxx" + uid[3:]
+        A rejected cookie becomes suspect, and dead once it has been rejected
+        HEALTH_DEAD_AFTER times in a row. Any accepted request makes it healthy.
+        """
+        if valid:
+            await self._set_cookie_health(cookie, None)
+            return
+        entry = dict(self._health.get(cookie_hash(cookie)) or {"failures": 0})
+        entry["failures"] += 1
+        entry["state"] = "dead" if entry["failures"] >= HEALTH_DEAD_AFTER else "suspect"
+        entry["checked"] = time.time()
+        await self._set_cookie_health(cookie, entry)
+
+    async def _set_cookie_health(self, cookie: str, entry: Optional[dict]):
+        """Persist a cookie's health entry; None marks it healthy, which is not stored."""
+        key = cookie_hash(cookie)
+        if entry is None:
+            if self._health.pop(key, None) is not None:
+                await self.config.cookie_health.clear_raw(key)
+            return
+        self._health[key] = entry
+        await self.config.cookie_health.set_raw(key, value=entry)
 
-            for _ in range(3):
-                try:
-                    reward = await client.claim_daily_reward(game=SUPPORTED_GAMES[game])
-                    results[game] = f"✅ {reward.amount}× {reward.name} (UID {censored})"
-                    break
+    async def _flush_account_cache(self):
+        """Persist the account cache to Config, dropping expired entries."""
+        if not self._account_cache_dirty:
+            return
+        cutoff = time.time() - ACCOUNT_CACHE_TTL
+        self._account_cache = {
+            k: v for k, v in self._account_cache.items() if v["fetched"] >= cutoff
+        }
+        self._account_cache_dirty = False
+        await self.config.account_cache.set(self._account_cache)
+
+    async def _api(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """Gateway for every HoYoLAB request, paced by the shared rate limiter.
+
+        Rate-limit responses make the limiter back off before the error is
+        passed on to the caller. Captchas are challenges on one account, not a
+        sign of overload, so they are left to the deferred retry queue.
+        """
+        await self._limiter.acquire()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            retcode = getattr(e, "retcode", None)
+            self._metrics.inc(
+                "hoyotools_api_responses_total",
+                endpoint=func.__name__,
+                # DailyGeetestTriggered fails with retcode 0
+                retcode=type(e).__name__ if not retcode else retcode,
+            )
+            if retcode in RATE_LIMIT_RETCODES:
+                self._limiter.backoff(RATE_LIMIT_COOLDOWN)
+            raise
+        self._metrics.inc(
+            "hoyotools_api_responses_total", endpoint=func.__name__, retcode=0
+        )
+        self._limiter.recover()
+        return result
+
+    async def _load_game_limits(self):
+        """Rebuild the per-game claim semaphores from adapter budgets and owner limits."""
+        limits = {a.bizes[0]: a.budget for a in GAME_ADAPTERS}
+        limits.update(await self.config.game_limits())
+        self._game_semaphores = {
+            game: asyncio.Semaphore(limit) for game, limit in limits.items() if limit
+        }
+
+    @asynccontextmanager
+    async def _game_slot(self, game: str):
+        sem = self._game_semaphores.get(game)
+        if sem is None:
+            yield
+            return
+        async with sem:
+            yield
+
+    async def claim_daily(
+        self, cookie: str, games: Optional[Collection[str]] = None
+    ) -> CookieClaim:
+        """Claim the daily rewards of every supported game on a cookie, or only ``games``.
+
+        Failures are not retried here: genshin.py already retries rate-limit
+        and timeout responses inside the client, and anything still failing
+        is left to the deferred retry queue.
+        """
+        client = self.get_client(cookie)
+
+        try:
+            accounts = await self.get_accounts(cookie)
+        except genshin.InvalidCookies:
+            return CookieClaim.failure("Invalid cookie", "invalid")
+        except Exception as e:
+            return CookieClaim.failure(f"❌ {e}", classify_claim_error(e))
+
+        game_accounts = {a.game_biz: a for a in accounts}
+        rejected = False
+
+        async def claim(game: str, account: AccountInfo) -> ClaimResult:
+            nonlocal rejected
+
+            start = time.monotonic()
+            try:
+                async with self._game_slot(game):
+                    reward = await self._api(
+                        client.claim_daily_reward, game=SUPPORTED_GAMES[game]
+                    )
+                result = ClaimResult(
+                    game,
+                    account.uid,
+                    ClaimStatus.SUCCESS,
+                    f"{reward.amount}× {reward.name}",
+                    None,
+                )
 
-                except genshin.AlreadyClaimed:
-                    results[game] = f"✅ Already claimed (UID {censored})"
-                    break
+            except genshin.AlreadyClaimed:
+                result = ClaimResult(game, account.uid, ClaimStatus.ALREADY, "", None)
 
-                except Exception as e:
-                    errors.append(f"❌ {GAME_NAMES.get(game)}: {e}")
-                    break
+            except Exception as e:
+                reason = classify_claim_error(e)
+                if reason == "invalid":
+                    self.forget_cookie(cookie)
+                    rejected = True
+                result = ClaimResult(
+                    game, account.uid, ClaimStatus.ERROR, str(e), reason
+                )
 
-        if errors:
-            results["errors"] = errors
+            self._metrics.observe(
+                "hoyotools_claim_seconds", time.monotonic() - start, game=game
+            )
+            self._metrics.inc(
+                "hoyotools_claims_total", game=game, result=result.status.value
+            )
+            return result
 
-        return results
+        # Claim every game on this cookie at once, keeping the account order
+        games = [
+            g
+            for g in game_accounts
+            if g in SUPPORTED_GAMES and (games is None or g in games)
+        ]
+        claims = await asyncio.gather(*(claim(g, game_accounts[g]) for g in games))
+        if rejected:
+            await self.record_cookie_health(cookie, False)
+        elif any(c.status is not ClaimStatus.ERROR for c in claims):
+            await self.record_cookie_health(cookie, True)
+        return CookieClaim(list(claims), [], None)
 
     async def redeem_codes(
         self,
         client: genshin.Client,
-        game_accounts: dict[str, genshin.Game],
+        game_accounts: dict[str, AccountInfo],
         codes: list[str],
     ):
-        results = []
-        remaining = set(codes)
+        """Redeem codes on the game accounts bound to one cookie.
+
+        A code whose game has been learned from an earlier redemption is only
+        sent to that game's account. Other codes are tried on every account at
+        once, and the first game that accepts one is remembered. Redemptions on
+        the same account are spaced out by the HoYoLAB cooldown.
+
+        Returns the results (in code order) and the codes no game accepted.
+        """
+        accounts = {g: a for g, a in game_accounts.items() if g in REDEEM_GAMES}
+        outcomes: dict[str, RedeemResult] = {}
 
+        # Known-dead codes never reach the API
         for code in codes:
-            redeemed = False
-            for game, account in game_accounts.items():
-                if game not in SUPPORTED_GAMES:
-                    continue
+            if self._codes.get(code, {}).get("status") == "expired":
+                outcomes[code] = RedeemResult(
+                    code, RedeemStatus.EXPIRED, None, None, ""
+                )
 
-                uid = str(account.uid)
-                censored = "xxx" + uid[3:]
+        async def redeem_on(game: str, account: AccountInfo):
+            for code in codes:
+                if code in outcomes:
+                    continue
+                known = self._code_games.get(code)
+                if known and known != game and known in accounts:
+                    continue
 
-                try:
-                    res = await client.redeem_code(
-                        code=code,
-                        game=SUPPORTED_GAMES[game],
-                    )
-                    results.append(
-                        f"🎁 Code `{code}` redeemed for {GAME_NAMES.get(game)} (UID {censored}): {res.message}"
-                    )
-                    redeemed = True
-                    break
-
-                except Exception as e:
-                    msg_lower = str(e).lower()
-                    # Handle common known responses without relying on non-existent exception types
-                    if "already" in msg_lower or "already redeemed" in msg_lower:
-                        results.append(
-                            f"❌ Code `{code}` already redeemed for {GAME_NAMES.get(game)} (UID {censored})"
+                async with self._redeem_scheduler.slot((game, account.uid)):
+                    # Another account may have settled the code while we waited
+                    if code in outcomes:
+                        continue
+                    try:
+                        await self._api(
+                            client.redeem_code,
+                            code=code,
+                            uid=account.uid,
+                            game=REDEEM_GAMES[game],
+                        )
+                    except Exception as e:
+                        kind = classify_redeem_error(e)
+                        if kind == "invalid":
+                            # Most likely a code for another game
+                            continue
+                        if kind == "expired":
+                            await self._set_code_status(code, "expired")
+                            status = RedeemStatus.EXPIRED
+                        elif kind == "claimed":
+                            await self._learn_code_game(code, game)
+                            status = RedeemStatus.CLAIMED
+                        else:
+                            status = RedeemStatus.ERROR
+                        outcomes[code] = RedeemResult(
+                            code, status, game, account.uid, str(e)
                         )
-                        redeemed = True
-                        break
-                    if "invalid" in msg_lower or "not found" in msg_lower:
-                        # Try next game
                         continue
-                    results.append(
-                        f"❌ Code `{code}` redemption error for {GAME_NAMES.get(game)} (UID {censored}): {e}"
+
+                    await self._learn_code_game(code, game)
+                    outcomes[code] = RedeemResult(
+                        code, RedeemStatus.REDEEMED, game, account.uid, "Redeemed"
                     )
-                    redeemed = True
-                    break
 
-            if redeemed:
-                remaining.discard(code)
+        await asyncio.gather(*(redeem_on(g, a) for g, a in accounts.items()))
 
+        results = [outcomes[code] for code in codes if code in outcomes]
+        remaining = {code for code in codes if code not in outcomes}
         return results, remaining
 
-    async def send_embed(
-        self, userOrChannel: Union[User, TextChannel, commands.Context, None], data
-    ):
-        embed = Embed(
-            title="HoYoLAB Daily Login",
-            color=0xE86D82 if data.get("errors") else 0xA385DE,
-        )
+    async def _learn_code_game(self, code: str, game: str):
+        """Remember which game a code belongs to so later redemptions skip the others.
 
-        embed.set_thumbnail(
-            url=random.choice(FAIL_ICONS if data.get("errors") else SUCCESS_ICONS)
-        )
+        A code that worked for a game is also known to be valid.
+        """
+        if code in self._codes:
+            await self._set_code_status(code, "valid")
+        if self._code_games.get(code) == game:
+            return
+        self._code_games[code] = game
+        await self.config.code_games.set_raw(code, value=game)
+
+    async def _set_code_status(self, code: str, status: str):
+        """Record a code's status in the global registry, adding expired codes if needed."""
+        entry = self._codes.get(code)
+        if entry is None:
+            if status != "expired":
+                return
+            entry = {"status": status, "added": utcnow().isoformat()}
+        elif entry["status"] == status:
+            return
+        entry["status"] = status
+        self._codes[code] = entry
+        await self.config.codes.set_raw(code, value=entry)
 
-        if data.get("errors"):
-            embed.add_field(
-                name="Errors",
-                value="\n".join(data["errors"]),
-                inline=False,
-            )
+    async def _fan_out_codes(self, codes: list[str]) -> dict:
+        """Redeem registry codes for every cookie of users who opted in to auto redeem.
+
+        Cookies are processed concurrently, bounded by the global concurrency
+        limit. Returns counts of redeemed codes and failed results.
+        """
+        stats = {"users": 0, "cookies": 0, "redeemed": 0, "failed": 0}
+        semaphore = asyncio.Semaphore(max(1, await self.config.max_concurrency()))
+
+        async def redeem_for_cookie(cookie: str):
+            async with semaphore:
+                try:
+                    accounts = await self.get_accounts(cookie)
+                    res, _ = await self.redeem_codes(
+                        self.get_client(cookie),
+                        {a.game_biz: a for a in accounts},
+                        codes,
+                    )
+                except Exception:
+                    stats["failed"] += 1
+                    return
+            redeemed = sum(r.redeemed for r in res)
+            stats["cookies"] += 1
+            stats["redeemed"] += redeemed
+            stats["failed"] += len(res) - redeemed
+
+        jobs = []
+        for udata in (await self.config.all_users()).values():
+            if not udata.get("auto_redeem"):
+                continue
+            cookies = self._vault.open_all(udata.get("vault", []))
+            if not cookies:
+                continue
+            stats["users"] += 1
+            jobs.extend(redeem_for_cookie(cookie) for cookie in cookies)
+
+        await asyncio.gather(*jobs)
+        await self._flush_account_cache()
+        return stats
 
-        for game, msg in data.items():
-            if game != "errors":
-                embed.add_field(
-                    name=GAME_NAMES.get(game, game),
-                    value=msg,
-                    inline=False,
+    def _build_login_embeds(self, results: list[CookieClaim]) -> list[Embed]:
+        """Merge the claim results of one or more cookies into as few embeds as possible.
+
+        Fields are prefixed with the cookie number when there is more than one
+        result, and a new page is started whenever an embed runs out of fields.
+        """
+        failed = any(data.failed for data in results)
+
+        fields = []
+        for idx, data in enumerate(results, start=1):
+            prefix = f"Cookie {idx} · " if len(results) > 1 else ""
+            errors = data.error_lines()
+            if errors:
+                fields.append((prefix + "Errors", "\n".join(errors)))
+            for claim in data.claimed():
+                fields.append(
+                    (prefix + GAME_NAMES.get(claim.game, claim.game), str(claim))
                 )
 
-        # Determine target: Context -> DM author, User -> DM, TextChannel -> channel send
-        if userOrChannel is None:
-            return
+        pages = [
+            fields[i : i + EMBED_MAX_FIELDS]
+            for i in range(0, len(fields), EMBED_MAX_FIELDS)
+        ] or [[]]
+
+        embeds = []
+        for number, page in enumerate(pages, start=1):
+            title = "HoYoLAB Daily Login"
+            if len(pages) > 1:
+                title += f" ({number}/{len(pages)})"
+            embed = Embed(title=title, color=0xE86D82 if failed else 0xA385DE)
+            embed.set_thumbnail(
+                url=random.choice(FAIL_ICONS if failed else SUCCESS_ICONS)
+            )
+            for name, value in page:
+                embed.add_field(name=name, value=value[:1024], inline=False)
+            embeds.append(embed)
+
+        return embeds
 
+    def _queue_login_dm(self, user: User, results: list[CookieClaim]):
+        """Queue one merged login DM for a user, dropping it if the queue is full."""
         try:
-            if isinstance(userOrChannel, commands.Context):
-                target = userOrChannel.author
-                await target.send(embed=embed)
-            elif isinstance(userOrChannel, User):
-                await userOrChannel.send(embed=embed)
-            elif isinstance(userOrChannel, TextChannel):
-                try:
-                    await userOrChannel.trigger_typing()
-                except Exception:
-                    pass
-                await userOrChannel.send(embed=embed)
-            else:
-                # Fallback: try to send if object supports send()
-                await userOrChannel.send(embed=embed)
-        except Exception as e:
-            log.exception("Failed to send embed: " + str(e))
+            self._dm_queue.put_nowait((user, results))
+        except asyncio.QueueFull:
+            self._dm_stats["dropped"] += 1
 
     async def _send(self, ctx, content=None, *, embed=None, ephemeral=True):
         if ctx.interaction:
+            if ctx.interaction.response.is_done():
+                return await ctx.interaction.followup.send(
+                    content=content, embed=embed, ephemeral=ephemeral
+                )
             return await ctx.interaction.response.send_message(
                 content=content, embed=embed, ephemeral=ephemeral
             )
@@ -231,6 +686,12 @@ class HoyoTools(commands.Cog):
         embed.add_field(name="✅ Successful claims", value=str(stats["success"]))
         embed.add_field(name="✅ Already claimed", value=str(stats["already"]))
         embed.add_field(name="❌ Errors", value=str(stats["errors"]))
+        if stats.get("skipped"):
+            embed.add_field(name="⏭️ Already done today", value=str(stats["skipped"]))
+        if stats.get("quarantined"):
+            embed.add_field(name="🚫 Quarantined", value=str(stats["quarantined"]))
+        if stats.get("deferred"):
+            embed.add_field(name="🔁 Retrying later", value=str(stats["deferred"]))
 
         if stats["per_game"]:
             games = "\n".join(
@@ -278,7 +739,7 @@ class HoyoTools(commands.Cog):
     async def remove_cookie(self, ctx: commands.Context, cookie: str):
         """Remove a saved cookie by a given index."""
 
-        cookies = await self.config.user(ctx.author).cookies()
+        cookies = await self.get_cookies(ctx.author.id)
 
         try:
             idx = int(cookie)
@@ -295,8 +756,9 @@ class HoyoTools(commands.Cog):
             )
             return
 
-        # removed = cookies.pop(idx - 1)
-        await self.config.user(ctx.author).cookies.set(cookies)
+        self.forget_cookie(cookies.pop(idx - 1))
+        await self.set_cookies(ctx.author.id, cookies)
+        await self.sync_roster(ctx.author.id)
 
         await ctx.interaction.response.send_message(
             "✅ Cookie removed.",
@@ -306,47 +768,52 @@ class HoyoTools(commands.Cog):
     @cookie.command(name="list", aliases=["show", "ls"])
     async def list_cookie(self, ctx: commands.Context):
         """List your saved cookies and try to detect account_id_v2 to differentiate them."""
-        cookies = await self.config.user(ctx.author).cookies()
+        cookies = await self.get_cookies(ctx.author.id)
         if not cookies:
             await self._send(ctx, "No cookies saved.")
             return
 
+        # Lookups may outlast Discord's 3 second response window
+        if ctx.interaction:
+            await ctx.interaction.response.defer(ephemeral=True)
+
         pattern = re.compile(r"account_id_v2=(\d+)")
         embed = Embed(title="Saved cookies", color=0xA385DE)
-        found_error = False
 
-        for idx, cookie in enumerate(cookies, start=1):
+        def preview(cookie: str) -> str:
+            m = pattern.search(cookie)
+            if m:
+                return f"account_id_v2: `{m.group(1)}`"
+            preview = cookie[:12] + "..." if len(cookie) > 15 else cookie
+            return f"`{preview}`"
+
+        async def describe(cookie: str) -> tuple[str, bool]:
             try:
-                client = self._make_client(cookie)
-                accounts = await client.get_game_accounts()
-                if accounts:
-                    parts = []
-                    for a in accounts:
-                        uid = str(a.uid)
-                        censored = "xxx" + uid[3:] if len(uid) > 3 else uid
-                        parts.append(
-                            f"{GAME_NAMES.get(a.game_biz, a.game_biz)}: UID {censored}"
-                        )
-                    value = "\n".join(parts)
-                else:
-                    m = pattern.search(cookie)
-                    if m:
-                        value = f"account_id_v2: `{m.group(1)}`"
-                    else:
-                        preview = cookie[:12] + "..." if len(cookie) > 15 else cookie
-                        value = f"`{preview}`"
+                accounts = await asyncio.wait_for(
+                    self.get_accounts(cookie), LIST_LOOKUP_TIMEOUT
+                )
             except genshin.InvalidCookies:
-                value = "❌ Invalid cookie"
-                found_error = True
+                return "❌ Invalid cookie", True
             except Exception:
-                m = pattern.search(cookie)
-                if m:
-                    value = f"account_id_v2: `{m.group(1)}`"
-                else:
-                    preview = cookie[:12] + "..." if len(cookie) > 15 else cookie
-                    value = f"`{preview}`"
+                # Timed out or failed, fall back to the cookie preview
+                return preview(cookie), False
+
+            if not accounts:
+                return preview(cookie), False
+
+            parts = []
+            for a in accounts:
+                uid = str(a.uid)
+                censored = "xxx" + uid[3:] if len(uid) > 3 else uid
+                parts.append(
+                    f"{GAME_NAMES.get(a.game_biz, a.game_biz)}: UID {censored}"
+                )
+            return "\n".join(parts), False
 
+        described = await asyncio.gather(*(describe(cookie) for cookie in cookies))
+        for idx, (value, _) in enumerate(described, start=1):
             embed.add_field(name=f"Cookie {idx}", value=value, inline=False)
+        found_error = any(invalid for _, invalid in described)
 
         if found_error:
             embed.color = await ctx.embed_color()
@@ -365,7 +832,7 @@ class HoyoTools(commands.Cog):
             await self._send(ctx, "Please use the slash command to manage cookies.")
             return
 
-        cookies = await self.config.user(ctx.author).cookies()
+        cookies = await self.get_cookies(ctx.author.id)
         if not cookies:
             await ctx.interaction.response.send_message(
                 "❌ No cookies saved.", ephemeral=True
@@ -411,7 +878,7 @@ class HoyoTools(commands.Cog):
             codes_set = set(parsed)
 
         # ───── Fetch cookies ─────
-        cookies = await self.config.user(ctx.author).cookies()
+        cookies = await self.get_cookies(ctx.author.id)
         if not cookies:
             await self._send(ctx, "❌ No cookies saved.")
             return
@@ -422,8 +889,8 @@ class HoyoTools(commands.Cog):
         # ───── Helper per-cookie task ─────
         async def redeem_for_cookie(idx: int, cookie: str, codes: set[str]):
             try:
-                client = self._make_client(cookie)
-                accounts = await client.get_game_accounts()
+                client = self.get_client(cookie)
+                accounts = await self.get_accounts(cookie)
                 game_accounts = {a.game_biz: a for a in accounts}
 
                 res, remaining = await self.redeem_codes(
@@ -432,13 +899,13 @@ class HoyoTools(commands.Cog):
                     list(codes),
                 )
 
-                success = sum("🎁" in r for r in res)
-                fail = sum("❌" in r for r in res)
+                success = sum(r.redeemed for r in res)
+                fail = len(res) - success
 
                 if res:
                     msg = (
                         f"Cookie {idx}: ✅ {success} success, ❌ {fail} failed\n"
-                        + "\n".join(res)
+                        + "\n".join(map(str, res))
                     )
                 else:
                     msg = f"Cookie {idx}: No codes redeemed."
@@ -452,18 +919,18 @@ class HoyoTools(commands.Cog):
                 return f"Cookie {idx}: ❌ Redemption error: {e}", set(codes)
 
         # ───── Run concurrently ─────
-        tasks = [
-            redeem_for_cookie(idx, cookie, remaining_global)
-            for idx, cookie in enumerate(cookies, start=1)
-        ]
-
+        # Every cookie is awaited so no redemption is left running unaccounted
         async with ctx.typing():
-            for coro in asyncio.as_completed(tasks):
-                msg, remaining = await coro
-                results.append(msg)
-                remaining_global &= remaining
-                if not remaining_global:
-                    break
+            outcomes = await asyncio.gather(
+                *(
+                    redeem_for_cookie(idx, cookie, codes_set)
+                    for idx, cookie in enumerate(cookies, start=1)
+                )
+            )
+
+        for msg, remaining in outcomes:
+            results.append(msg)
+            remaining_global &= remaining
 
         # ───── Save remaining codes only if changed ─────
         try:
@@ -504,7 +971,7 @@ class HoyoTools(commands.Cog):
             enabled = not current
 
         if enabled:
-            cookies = await self.config.user(ctx.author).cookies()
+            cookies = await self.get_cookies(ctx.author.id)
             if not cookies:
                 await self._send(
                     ctx, "❌ No cookies saved. Add a cookie before enabling auto login."
@@ -516,6 +983,7 @@ class HoyoTools(commands.Cog):
         except Exception as e:
             await self._send(ctx, "❌ Failed to update auto login: " + str(e))
             return
+        await self.sync_roster(ctx.author.id)
 
         await self._send(
             ctx, ("✅ Auto login enabled." if enabled else "✅ Auto login disabled.")
@@ -537,6 +1005,7 @@ class HoyoTools(commands.Cog):
         except Exception as e:
             await self._send(ctx, "❌ Failed to update login notify: " + str(e))
             return
+        await self.sync_roster(ctx.author.id)
 
         await self._send(
             ctx,
@@ -547,6 +1016,23 @@ class HoyoTools(commands.Cog):
             ),
         )
 
+    @config.command(name="autoredeem")
+    async def auto_redeem(self, ctx: commands.Context, enabled: Optional[bool] = None):
+        """Automatically redeem new codes added by the bot owner. If no value is provided, toggles current state."""
+        current = await self.config.user(ctx.author).auto_redeem()
+        if enabled is None:
+            enabled = not current
+
+        await self.config.user(ctx.author).auto_redeem.set(enabled)
+        await self._send(
+            ctx,
+            (
+                "✅ Automatic code redemption enabled."
+                if enabled
+                else "✅ Automatic code redemption disabled."
+            ),
+        )
+
     # ──────────────── GLOBAL SETTINGS ────────────────
 
     @config.command(name="autologin")
@@ -602,49 +1088,226 @@ class HoyoTools(commands.Cog):
         except Exception as e:
             await self._send(ctx, "Failed to set channel ID: " + str(e))
 
+    @config.command(name="concurrency")
+    @commands.is_owner()
+    async def set_concurrency(self, ctx: commands.Context, limit: int):
+        """Set how many cookies the global auto login claims at the same time."""
+        if limit < 1:
+            await self._send(ctx, "❌ Concurrency must be at least 1.")
+            return
+
+        await self.config.max_concurrency.set(limit)
+        await self._send(
+            ctx, f"✅ Global auto login will claim up to {limit} cookies at once."
+        )
+
+    @config.command(name="gamelimit")
+    @commands.is_owner()
+    async def set_game_limit(self, ctx: commands.Context, game: str, limit: int):
+        """Limit concurrent claims for one game (e.g. `hk4e_global`). Set to 0 to remove the limit."""
+        game = game.lower()
+        if game not in SUPPORTED_GAMES:
+            await self._send(
+                ctx, "❌ Unknown game. Valid games: " + ", ".join(SUPPORTED_GAMES)
+            )
+            return
+        if limit < 0:
+            await self._send(ctx, "❌ Limit cannot be negative.")
+            return
+
+        # An explicit 0 is stored too, so it overrides the adapter's default budget
+        async with self.config.game_limits() as limits:
+            limits[game] = limit
+        await self._load_game_limits()
+
+        name = GAME_NAMES.get(game, game)
+        await self._send(
+            ctx,
+            (
+                f"✅ {name} claims limited to {limit} at once."
+                if limit
+                else f"✅ Removed claim limit for {name}."
+            ),
+        )
+
+    @config.command(name="ratelimit")
+    @commands.is_owner()
+    async def set_rate_limit(self, ctx: commands.Context, rate: float):
+        """Set the maximum HoYoLAB requests per second shared by all features."""
+        if rate <= 0:
+            await self._send(ctx, "❌ Rate must be greater than 0.")
+            return
+
+        await self.config.rate_limit.set(rate)
+        self._limiter.set_rate(rate)
+        await self._send(ctx, f"✅ HoYoLAB requests limited to {rate:g} per second.")
+
+    @config.command(name="shards")
+    @commands.is_owner()
+    async def set_shards(
+        self, ctx: commands.Context, count: int, window: Optional[int] = None
+    ):
+        """Spread the daily auto login over `count` shards started across `window` minutes after the login time.
+
+        Changes take effect from the next daily run.
+        """
+        if count < 1:
+            await self._send(ctx, "❌ Shard count must be at least 1.")
+            return
+        if window is not None and window < 0:
+            await self._send(ctx, "❌ Window cannot be negative.")
+            return
+
+        await self.config.shard_count.set(count)
+        if window is not None:
+            await self.config.shard_window.set(window)
+        window = await self.config.shard_window()
+
+        await self._send(
+            ctx, f"✅ Auto login split into {count} shard(s) over {window} minutes."
+        )
+
     # ──────────────── USER COMMANDS ────────────────
 
     @hoyo.command()
     async def run(self, ctx):
         """Run daily login for account cookies saved in your user settings."""
-        cookies = await self.config.user(ctx.author).cookies()
+        cookies = await self.get_cookies(ctx.author.id)
         if not cookies:
             await self._send(ctx, "No cookies saved.")
             return
 
-        async with ctx.typing():
-            for cookie in cookies:
-                data = await self.claim_daily(cookie)
-                await self.send_embed(ctx, data)
+        if ctx.interaction:
+            await ctx.interaction.response.defer(ephemeral=True)
+
+        marks = ["⏳"] * len(cookies)
 
-        await self._send(ctx, "✅ Daily login task completed.")
+        def progress(done: int) -> str:
+            return f"🔄 Claiming daily rewards ({done}/{len(cookies)})\n" + "\n".join(
+                f"Cookie {idx}: {mark}" for idx, mark in enumerate(marks, start=1)
+            )
+
+        msg = await self._send(ctx, progress(0))
+
+        async def claim(idx: int, cookie: str) -> tuple[int, CookieClaim]:
+            try:
+                return idx, await self.claim_daily(cookie)
+            except Exception as e:
+                log.exception(f"Daily login claim failed for user {ctx.author.id}")
+                return idx, CookieClaim.failure(f"❌ {e}")
+
+        # Claim every cookie at once and update the progress message as they finish
+        results: list[Optional[CookieClaim]] = [None] * len(cookies)
+        last_edit = time.monotonic()
+        jobs = [claim(idx, cookie) for idx, cookie in enumerate(cookies)]
+        for done, job in enumerate(asyncio.as_completed(jobs), start=1):
+            idx, data = await job
+            results[idx] = data
+            marks[idx] = "❌" if data.failed else "✅"
+            if (
+                done < len(cookies)
+                and time.monotonic() - last_edit >= PROGRESS_INTERVAL
+            ):
+                last_edit = time.monotonic()
+                try:
+                    await msg.edit(content=progress(done))
+                except Exception:
+                    pass
+
+        embeds = self._build_login_embeds(results)
+        try:
+            if ctx.interaction:
+                # Ephemeral, so the results can be shown in place
+                await msg.edit(
+                    content="✅ Daily login task completed.", embeds=embeds[:10]
+                )
+                return
+            await msg.edit(content="✅ Daily login task completed.")
+        except Exception:
+            log.exception("Failed to update daily login progress message.")
+
+        try:
+            for embed in embeds:
+                await ctx.author.send(embed=embed)
+        except Exception as e:
+            log.exception("Failed to send embed: " + str(e))
 
     # ──────────────── OWNER COMMANDS ────────────────
 
     @hoyo.command(name="status", aliases=["lastrun", "health"])
     @commands.is_owner()
     async def status(self, ctx):
-        """Check the last run time of the daily auto-login task."""
+        """Check the last run time of the daily auto-login task and API throttling."""
+        lines = []
+
         last = await self.config.last_run()
         if not last:
-            await ctx.send("Last run: Never")
-            return
-        try:
-            dt = datetime.fromisoformat(last)
-            epoch = int((dt - datetime(1970, 1, 1)).total_seconds())
-            await ctx.send(f"Last run: <t:{epoch}:F> (<t:{epoch}:R>)")
-        except Exception:
-            await ctx.send(f"Last run: {last}")
+            lines.append("Last run: Never")
+        else:
+            try:
+                dt = datetime.fromisoformat(last)
+                epoch = int((dt - datetime(1970, 1, 1)).total_seconds())
+                lines.append(f"Last run: <t:{epoch}:F> (<t:{epoch}:R>)")
+            except Exception:
+                lines.append(f"Last run: {last}")
+
+        state = await self.config.shard_state()
+        if state.get("count", 1) > 1:
+            lines.append(
+                f"Shards completed on {state['date']}: "
+                f"{len(state['done'])}/{state['count']}"
+            )
+
+        limiter = self._limiter
+        throttle = (
+            f"paused for {int(limiter.paused_for)}s"
+            if limiter.paused_for
+            else "throttled"
+            if limiter.rate < limiter.base_rate
+            else "normal"
+        )
+        lines.append(
+            f"HoYoLAB requests: {limiter.throughput:.2f}/s "
+            f"(limit {limiter.rate:.2f}/s of {limiter.base_rate:.2f}/s, {throttle})"
+        )
+        lines.append(f"Rate-limit/captcha responses: {limiter.throttled}")
+
+        states = [entry["state"] for entry in self._health.values()]
+        lines.append(
+            f"Cookie health: {states.count('suspect')} suspect, "
+            f"{states.count('dead')} dead (quarantined)"
+        )
+
+        lines.append(
+            f"Cookies in memory: {len(self._vault)} decrypted, "
+            f"{len(self._clients)} clients (limit {self._vault.max_size}, "
+            f"idle {int(self._vault.idle_ttl // 60)}m"
+            f"{', wiped after each run' if await self.config.vault_wipe() else ''})"
+        )
+
+        lines.append(f"Deferred claim retries: {len(self._retries)} cookies queued")
+
+        dm = self._dm_stats
+        lines.append(
+            f"Login DMs: {self._dm_queue.qsize()} queued, {dm['sent']} sent, "
+            f"{dm['forbidden']} forbidden, {dm['dropped']} dropped, {dm['failed']} failed"
+        )
+
+        await ctx.send("\n".join(lines))
 
     @hoyo.command(name="runglobal")
     @commands.is_owner()
-    async def runglobal(self, ctx: commands.Context):
-        """Run the daily auto-login task manually for all users."""
+    async def runglobal(self, ctx: commands.Context, force: bool = False):
+        """Run the daily auto-login task manually for all users.
+
+        Cookies already claimed today are skipped unless `force` is true.
+        """
         msg = await self._send(ctx, "🔄 Running global daily login task...")
 
         try:
             async with self._task_lock:
-                await self._perform_auto_login()
+                stats = await self._perform_auto_login(resume=not force)
+            await self._post_summary(stats)
         except Exception as e:
             log.exception("Failed to run global daily login task manually.")
             await msg.edit(content="❌ Global daily login task failed: " + str(e))
@@ -652,11 +1315,249 @@ class HoyoTools(commands.Cog):
 
         await self._send(ctx, "✅ Global daily login task completed.")
 
+    @hoyo.group(name="metrics")
+    @commands.is_owner()
+    async def metrics(self, ctx: commands.Context):
+        """Inspect claim metrics collected since the cog was loaded"""
+
+    def _refresh_gauges(self):
+        """Copy point-in-time values kept elsewhere into the metrics registry."""
+        self._metrics.set("hoyotools_dm_queue_depth", self._dm_queue.qsize())
+        for outcome, count in self._dm_stats.items():
+            self._metrics.set("hoyotools_dms", count, outcome=outcome)
+        self._metrics.set("hoyotools_api_throughput", self._limiter.throughput)
+        self._metrics.set("hoyotools_api_rate_limit", self._limiter.rate)
+        self._metrics.set("hoyotools_client_pool_size", len(self._clients))
+
+    @metrics.command(name="show")
+    async def show_metrics(self, ctx: commands.Context):
+        """Show claim latency, outcomes, API retcodes and worker utilisation."""
+        self._refresh_gauges()
+        m = self._metrics
+        embed = Embed(title="📈 HoyoTools Metrics", color=0xA385DE)
+
+        outcomes = m.counters.get("hoyotools_claims_total", {})
+        for key, hist in m.histograms.get("hoyotools_claim_seconds", {}).items():
+            game = dict(key)["game"]
+            counts = {
+                dict(k)["result"]: v
+                for k, v in outcomes.items()
+                if dict(k)["game"] == game
+            }
+            embed.add_field(
+                name=GAME_NAMES.get(game, game),
+                value=(
+                    f"Claims: {hist.count} (✅ {counts.get('success', 0):g} · "
+                    f"🔁 {counts.get('already', 0):g} · ❌ {counts.get('error', 0):g})\n"
+                    f"p50 ≤ {hist.quantile(0.5):g}s · p99 ≤ {hist.quantile(0.99):g}s"
+                ),
+                inline=False,
+            )
+
+        retcodes: dict[str, float] = {}
+        for key, count in m.counters.get("hoyotools_api_responses_total", {}).items():
+            retcode = dict(key)["retcode"]
+            retcodes[retcode] = retcodes.get(retcode, 0) + count
+        if retcodes:
+            embed.add_field(
+                name="API retcodes",
+                value="\n".join(
+                    f"`{code}`: {count:g}"
+                    for code, count in sorted(retcodes.items(), key=lambda x: -x[1])
+                )[:1024],
+                inline=False,
+            )
+
+        if m.value("hoyotools_runs_total"):
+            embed.add_field(
+                name="Last global run",
+                value=(
+                    f"Duration: {m.value('hoyotools_run_seconds'):.1f}s\n"
+                    f"Workers: {m.value('hoyotools_run_workers'):g} "
+                    f"(peak busy {m.value('hoyotools_run_peak_workers_busy'):g}, "
+                    f"{m.value('hoyotools_run_worker_utilisation'):.0%} utilised)"
+                ),
+                inline=False,
+            )
+
+        embed.add_field(
+            name="Queues",
+            value=(
+                f"DM queue depth: {m.value('hoyotools_dm_queue_depth'):g}\n"
+                f"Clients pooled: {m.value('hoyotools_client_pool_size'):g}"
+            ),
+            inline=False,
+        )
+        await self._send(ctx, embed=embed)
+
+    @metrics.command(name="export")
+    async def export_metrics(self, ctx: commands.Context, path: Optional[str] = None):
+        """Write all metrics in Prometheus text format to a file.
+
+        Defaults to `metrics.prom` in the cog's data folder.
+        """
+        self._refresh_gauges()
+        target = Path(path) if path else cog_data_path(self) / "metrics.prom"
+        try:
+            target.write_text(self._metrics.render(), encoding="utf-8")
+        except OSError as e:
+            await self._send(ctx, f"❌ Failed to write metrics: {e}")
+            return
+        await self._send(ctx, f"✅ Metrics written to `{target}`.")
+
+    @metrics.command(name="reset")
+    async def reset_metrics(self, ctx: commands.Context):
+        """Clear all collected metrics."""
+        self._metrics.clear()
+        await self._send(ctx, "✅ Metrics cleared.")
+
+    @hoyo.group(name="vault")
+    @commands.is_owner()
+    async def vault(self, ctx: commands.Context):
+        """Control how long decrypted cookies stay in memory"""
+
+    @vault.command(name="cache")
+    async def vault_cache(
+        self, ctx: commands.Context, size: int, idle_minutes: Optional[int] = None
+    ):
+        """Set how many decrypted cookies and clients are kept, and for how long when unused."""
+        if size < 1 or (idle_minutes is not None and idle_minutes < 1):
+            await self._send(ctx, "❌ Size and idle minutes must be at least 1.")
+            return
+
+        ttl = idle_minutes * 60 if idle_minutes else await self.config.vault_idle_ttl()
+        await self.config.vault_cache_size.set(size)
+        await self.config.vault_idle_ttl.set(ttl)
+        self._vault.max_size = self._clients.max_size = size
+        self._vault.idle_ttl = self._clients.idle_ttl = ttl
+        await self._send(
+            ctx,
+            f"✅ Keeping up to {size} decrypted cookies, "
+            f"dropped after {ttl // 60} minutes unused.",
+        )
+
+    @vault.command(name="wipe")
+    async def vault_wipe(self, ctx: commands.Context, enabled: Optional[bool] = None):
+        """Drop every decrypted cookie after each global run. Toggles if no value is provided."""
+        if enabled is None:
+            enabled = not await self.config.vault_wipe()
+        await self.config.vault_wipe.set(enabled)
+        await self._send(
+            ctx,
+            (
+                "✅ Decrypted cookies will be wiped after each run."
+                if enabled
+                else "✅ Decrypted cookies will be kept until they go idle."
+            ),
+        )
+
+    @vault.command(name="purge")
+    async def vault_purge(self, ctx: commands.Context):
+        """Drop every decrypted cookie and pooled client now."""
+        self._vault.purge()
+        self._clients.clear()
+        await self._send(ctx, "✅ Decrypted cookies purged from memory.")
+
+    # ──────────────── CODE REGISTRY ────────────────
+
+    @hoyo.group(name="codes")
+    @commands.is_owner()
+    async def code_registry(self, ctx: commands.Context):
+        """Manage the global redemption code registry"""
+
+    @code_registry.command(name="add")
+    async def add_codes(self, ctx: commands.Context, *, codes: str):
+        """Add codes and redeem them for every user who enabled auto redeem.
+
+        Codes already known as expired are ignored.
+        """
+        parsed = [c.strip().upper() for c in re.split(r"[,\s]+", codes) if c.strip()]
+        new = []
+        for code in dict.fromkeys(parsed):
+            if self._codes.get(code, {}).get("status") == "expired":
+                continue
+            if code not in self._codes:
+                entry = {"status": "unknown", "added": utcnow().isoformat()}
+                self._codes[code] = entry
+                await self.config.codes.set_raw(code, value=entry)
+            new.append(code)
+
+        if not new:
+            await self._send(ctx, "❌ No new valid codes provided.")
+            return
+
+        await self._send(
+            ctx, f"🔄 Redeeming {len(new)} code(s) for all opted-in users..."
+        )
+
+        async def fan_out():
+            try:
+                stats = await self._fan_out_codes(new)
+            except Exception:
+                log.exception("Failed to redeem registry codes.")
+                return
+            try:
+                await ctx.channel.send(
+                    f"✅ Redeemed {', '.join(f'`{c}`' for c in new)} for "
+                    f"{stats['users']} user(s) / {stats['cookies']} cookie(s): "
+                    f"🎁 {stats['redeemed']} redeemed, ❌ {stats['failed']} failed."
+                )
+            except Exception:
+                log.exception("Failed to send code redemption summary.")
+
+        task = asyncio.create_task(fan_out())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    @code_registry.command(name="expire")
+    async def expire_code(self, ctx: commands.Context, code: str):
+        """Mark a code as expired so it is never sent to HoYoLAB again."""
+        code = code.upper()
+        await self._set_code_status(code, "expired")
+        await self._send(ctx, f"✅ Code `{code}` marked as expired.")
+
+    @code_registry.command(name="remove", aliases=["delete"])
+    async def remove_code(self, ctx: commands.Context, code: str):
+        """Remove a code from the registry."""
+        code = code.upper()
+        if self._codes.pop(code, None) is None:
+            await self._send(ctx, "❌ Code not found in the registry.")
+            return
+        await self.config.codes.clear_raw(code)
+        await self._send(ctx, f"✅ Code `{code}` removed.")
+
+    @code_registry.command(name="list", aliases=["show", "ls"])
+    async def list_codes(self, ctx: commands.Context):
+        """List codes in the registry with their status and game."""
+        if not self._codes:
+            await self._send(ctx, "No codes in the registry.")
+            return
+
+        icons = {"valid": "✅", "expired": "❌", "unknown": "❔"}
+        lines = []
+        for code, entry in sorted(self._codes.items()):
+            game = self._code_games.get(code)
+            line = f"{icons.get(entry['status'], '❔')} `{code}` ({entry['status']})"
+            if game:
+                line += f" · {GAME_NAMES.get(game, game)}"
+            lines.append(line)
+
+        embed = Embed(
+            title="Redemption Code Registry",
+            description="\n".join(lines)[:4000],
+            color=0xA385DE,
+        )
+        await self._send(ctx, embed=embed)
+
     # ──────────────── TASKS ────────────────
 
     @tasks.loop(minutes=1)
     async def daily_task(self):
         await self.bot.wait_until_ready()
+        self._clients.evict_idle()
+        self._vault.evict_idle()
+        self._redeem_scheduler.prune()
+        await self._flush_account_cache()
 
         if not await self.config.auto_login():
             return
@@ -670,104 +1571,420 @@ class HoyoTools(commands.Cog):
 
         now = utcnow()
         scheduled = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if now < scheduled:
+            return
 
         last_run_str = await self.config.last_run()
         last_run = datetime.fromisoformat(last_run_str) if last_run_str else None
 
-        # Missed run (bot offline / restart)
-        if last_run is None or last_run.date() < now.date():
-            if now >= scheduled:
-                log.info("Performing missed auto login task.")
-                async with self._task_lock:
-                    await self._perform_auto_login()
-                await self.config.last_run.set(utcnow().isoformat())
-            return
+        # Start a fresh set of shards once per day, resuming unfinished ones after a restart
+        state = await self.config.shard_state()
+        today = now.date().isoformat()
+        if state.get("date") != today:
+            count = max(1, await self.config.shard_count())
+            finished = last_run is not None and last_run >= scheduled
+            state = {
+                "date": today,
+                "count": count,
+                "done": list(range(count)) if finished else [],
+                "stats": self._new_stats(),
+            }
+            await self.config.shard_state.set(state)
+
+        # Keep the whole window inside the current UTC day
+        window = min(
+            await self.config.shard_window(), 24 * 60 - 1 - (hour * 60 + minute)
+        )
+        count = state["count"]
+        for shard in range(count):
+            if shard in state["done"]:
+                continue
+            if utcnow() < scheduled + timedelta(minutes=window * shard / count):
+                break
 
-        # Normal scheduled run
-        if now >= scheduled and last_run < scheduled:
-            log.info("Performing scheduled auto login task.")
+            log.info(f"Performing auto login shard {shard + 1}/{count}.")
             async with self._task_lock:
-                await self._perform_auto_login()
+                stats = await self._perform_auto_login(shard, count)
+            self._merge_stats(state["stats"], stats)
+            state["done"].append(shard)
+            await self.config.shard_state.set(state)
+
+        if len(state["done"]) == count and (last_run is None or last_run < scheduled):
             await self.config.last_run.set(utcnow().isoformat())
+            await self._post_summary(state["stats"])
+
+    async def _perform_auto_login(
+        self, shard: Optional[int] = None, shard_count: int = 1, resume: bool = True
+    ) -> dict:
+        """Perform the auto login for all cookies and optionally DM users.
+
+        If ``shard`` is given, only users hashed into that shard out of
+        ``shard_count`` are processed. Unless ``resume`` is False, cookies
+        checkpointed as claimed today are skipped. Returns the run stats.
+        """
+
+        stats = self._new_stats()
+
+        # Only opted-in users are on the roster; their cookies are loaded per job
+        users = {int(user_id): entry for user_id, entry in self._roster.items()}
+        if shard is not None:
+            users = {
+                user_id: entry
+                for user_id, entry in users.items()
+                if shard_of(user_id, shard_count) == shard
+            }
+
+        await self._load_game_limits()
+        workers = max(1, await self.config.max_concurrency())
+        semaphore = asyncio.Semaphore(workers)
+
+        started = time.monotonic()
+        busy_before = self._metrics.value("hoyotools_worker_busy_seconds_total")
+        self._metrics.set("hoyotools_run_peak_workers_busy", 0)
+
+        await self._load_checkpoint()
+        jobs = [
+            self._auto_login_user(semaphore, user_id, entry, resume)
+            for user_id, entry in users.items()
+        ]
+        for results in await asyncio.gather(*jobs):
+            if results is None:
+                continue
+            claimed = [data for data in results if isinstance(data, CookieClaim)]
+            quarantined = results.count(QUARANTINED)
+            stats["quarantined"] += quarantined
+            stats["skipped"] += len(results) - len(claimed) - quarantined
+            if not claimed:
+                continue
+            stats["users"] += 1
+            for data in claimed:
+                self._tally_claim(stats, data)
+
+        duration = time.monotonic() - started
+        busy = self._metrics.value("hoyotools_worker_busy_seconds_total") - busy_before
+        self._metrics.inc("hoyotools_runs_total")
+        self._metrics.set("hoyotools_run_seconds", duration)
+        self._metrics.set("hoyotools_run_workers", workers)
+        self._metrics.set(
+            "hoyotools_run_worker_utilisation",
+            busy / (workers * duration) if duration else 0,
+        )
+
+        if await self.config.vault_wipe():
+            self._vault.purge()
+            self._clients.clear()
+
+        await self._flush_checkpoint()
+        await self._flush_account_cache()
+        return stats
+
+    async def _load_checkpoint(self):
+        """Load today's claimed cookie fingerprints, discarding older checkpoints."""
+        today = utcnow().date().isoformat()
+        checkpoint = await self.config.checkpoint()
+        if checkpoint.get("date") == today:
+            self._checkpoint = set(checkpoint.get("done", []))
+        else:
+            self._checkpoint = set()
+        self._checkpoint_date = today
+        self._checkpoint_pending = 0
+
+    async def _checkpoint_cookie(self, cookie: str):
+        """Record a cookie as claimed today, writing to Config every CHECKPOINT_BATCH cookies."""
+        self._checkpoint.add(cookie_hash(cookie))
+        self._checkpoint_pending += 1
+        if self._checkpoint_pending >= CHECKPOINT_BATCH:
+            await self._flush_checkpoint()
+
+    async def _flush_checkpoint(self):
+        if not self._checkpoint_pending:
+            return
+        self._checkpoint_pending = 0
+        await self.config.checkpoint.set(
+            {"date": self._checkpoint_date, "done": list(self._checkpoint)}
+        )
+
+    async def _post_summary(self, stats: dict):
+        """Send the run summary embed to the auto login channel, if one is set."""
+        channel_id = await self.config.auto_login_channel()
+        if not channel_id:
+            return
+
+        channel: Optional[TextChannel] = self.bot.get_channel(channel_id)
+        if channel is None:
+            try:
+                channel = await self.bot.fetch_channel(channel_id)
+            except Exception:
+                log.exception(
+                    "Failed to fetch auto login channel, fallback to logging only."
+                )
+                return
+
+        try:
+            embed = self._build_summary_embed(stats)
+            await channel.send(embed=embed)
+        except Exception as e:
+            log.exception("Failed to send auto login summary embed: " + str(e))
+
+    async def _auto_login_user(
+        self,
+        semaphore: asyncio.Semaphore,
+        user_id: int,
+        entry: dict,
+        resume: bool = True,
+    ) -> Optional[list[Union[CookieClaim, str, None]]]:
+        """Claim all cookies of a single roster user and DM them the results.
+
+        The user's cookies are only read from config once they are known to
+        be reachable. Claims run concurrently but each one holds a slot of the
+        shared ``semaphore``. With ``resume``, cookies already claimed today
+        according to the checkpoint are skipped and reported as None, and
+        quarantined cookies as QUARANTINED. Returns the claim results, or None
+        if the user was skipped.
+        """
+        try:
+            user = self.bot.get_user(user_id)
+            if not user:
+                return None
 
-    async def _perform_auto_login(self):
-        """Perform the auto login for all cookies and send embeds to channel and optionally DM users."""
+            cookies = await self.get_cookies(user_id)
+            if not cookies:
+                # The roster is stale, e.g. cookies were edited by hand
+                await self.sync_roster(user_id)
+                return None
+
+            async def claim(cookie: str) -> Union[CookieClaim, str, None]:
+                if resume and cookie_hash(cookie) in self._checkpoint:
+                    return None
+                # Quarantined until health_task sees HoYoLAB accept it again
+                if self.cookie_state(cookie) == "dead":
+                    return QUARANTINED
+                queued = time.monotonic()
+                async with semaphore:
+                    started = time.monotonic()
+                    self._metrics.observe(
+                        "hoyotools_worker_wait_seconds", started - queued
+                    )
+                    self._metrics.add("hoyotools_workers_busy", 1)
+                    busy = self._metrics.value("hoyotools_workers_busy")
+                    if busy > self._metrics.value("hoyotools_run_peak_workers_busy"):
+                        self._metrics.set("hoyotools_run_peak_workers_busy", busy)
+                    try:
+                        data = await self.claim_daily(cookie)
+                    finally:
+                        self._metrics.add("hoyotools_workers_busy", -1)
+                        self._metrics.inc(
+                            "hoyotools_worker_busy_seconds_total",
+                            time.monotonic() - started,
+                        )
+                if not data.failed:
+                    await self._checkpoint_cookie(cookie)
+                await self._defer_claim(user_id, cookie, data)
+                return data
+
+            results = []
+            for data in await asyncio.gather(
+                *(claim(cookie) for cookie in cookies), return_exceptions=True
+            ):
+                if isinstance(data, Exception):
+                    log.error(
+                        f"Auto login claim failed for user {user_id}", exc_info=data
+                    )
+                    data = CookieClaim.failure(f"❌ {data}")
+                results.append(data)
+
+            # Queue a single merged DM if the user opted in
+            claimed = [data for data in results if isinstance(data, CookieClaim)]
+            if claimed and entry.get("notify", True):
+                self._queue_login_dm(user, claimed)
 
-        stats = {
+            return results
+
+        except Exception:
+            log.exception(f"Failed processing auto login for user {user_id}")
+            return None
+
+    @staticmethod
+    def _new_stats() -> dict:
+        return {
             "users": 0,
             "cookies": 0,
             "success": 0,
             "already": 0,
             "errors": 0,
+            "skipped": 0,
+            "quarantined": 0,
+            "deferred": 0,
             "per_game": {},
         }
 
-        channel_id = await self.config.auto_login_channel()
-        channel: Optional[TextChannel] = None
-        if channel_id:
-            channel = self.bot.get_channel(channel_id)
-            if channel is None:
-                try:
-                    channel = await self.bot.fetch_channel(channel_id)
-                except Exception:
-                    log.exception(
-                        "Failed to fetch auto login channel, fallback to logging only."
-                    )
-                    channel = None
-
+    @staticmethod
+    def _merge_stats(total: dict, stats: dict):
+        for key, value in stats.items():
+            if key == "per_game":
+                for game, count in value.items():
+                    total["per_game"][game] = total["per_game"].get(game, 0) + count
+            else:
+                total[key] = total.get(key, 0) + value
+
+    @staticmethod
+    def _tally_claim(stats: dict, data: CookieClaim):
+        stats["cookies"] += 1
+        if data.failed:
+            stats["errors"] += 1
+        stats["deferred"] += len(data.retry_reasons())
+        for claim in data.claimed():
+            per_game = stats["per_game"]
+            per_game[claim.game] = per_game.get(claim.game, 0) + 1
+            stats[claim.status.value] += 1
+
+    @tasks.loop(seconds=DM_INTERVAL)
+    async def dm_task(self):
+        """Deliver queued login DMs one user at a time, paced by DM_INTERVAL."""
+        user, results = await self._dm_queue.get()
         try:
-            users = await self.config.all_users()
+            for embed in self._build_login_embeds(results):
+                await user.send(embed=embed)
+            self._dm_stats["sent"] += 1
+        except Forbidden:
+            self._dm_stats["forbidden"] += 1
         except Exception:
-            log.exception("Failed to fetch user configs, auto login task aborted.")
+            self._dm_stats["failed"] += 1
+            log.exception(f"Failed to send login DM to user {user.id}")
+
+    @tasks.loop(hours=1)
+    async def health_task(self):
+        """Re-validate a few quarantined cookies that have not been checked for a while."""
+        cutoff = time.time() - HEALTH_RECHECK_INTERVAL
+        due = {
+            key
+            for key, entry in self._health.items()
+            if entry["state"] == "dead" and entry["checked"] <= cutoff
+        }
+        if not due:
             return
 
-        for user_id, udata in users.items():
-            try:
-                if not udata.get("auto_login"):
+        checked = 0
+        for user_id in list(self._roster):
+            for cookie in await self.get_cookies(int(user_id)):
+                if cookie_hash(cookie) not in due:
                     continue
+                self.forget_cookie(cookie)
+                try:
+                    await self.get_accounts(cookie)
+                except genshin.InvalidCookies:
+                    # get_accounts already recorded the failure
+                    pass
+                except Exception:
+                    log.exception("Failed to re-validate a quarantined cookie.")
+                else:
+                    await self.record_cookie_health(cookie, True)
+                checked += 1
+                if checked >= HEALTH_RECHECK_BATCH:
+                    return
 
-                cookies = udata.get("cookies", []) or []
-                if not cookies:
-                    continue
+    async def _defer_claim(self, user_id: int, cookie: str, data: CookieClaim):
+        """Queue a cookie's retryable failed games for later today, or drop its entry.
 
-                user = self.bot.get_user(user_id)
-                if not user:
-                    continue
+        The slowest failure class among the games sets the base delay, which
+        doubles with every attempt. Entries that run out of attempts or would
+        fall past the end of the day are dropped.
+        """
+        key = cookie_hash(cookie)
+        reasons = data.retry_reasons()
+        today = utcnow().date().isoformat()
+        prev = self._retries.get(key)
+        attempt = prev["attempt"] + 1 if prev and prev["date"] == today else 0
+
+        due = 0.0
+        if reasons and attempt < DEFERRED_RETRY_ATTEMPTS:
+            base = max(DEFERRED_RETRY_DELAYS[r] for r in reasons)
+            due = time.time() + backoff_delay(base, attempt)
+            midnight = (utcnow() + timedelta(days=1)).replace(
+                hour=0, minute=0, second=0, microsecond=0
+            )
+            if due >= midnight.timestamp():
+                due = 0.0
 
-                for cookie in cookies:
-                    data = await self.claim_daily(cookie)
+        if not due:
+            if self._retries.pop(key, None) is not None:
+                await self.config.retry_queue.clear_raw(key)
+            return
 
-                    # Send DM to user if they opted in
-                    try:
-                        if udata.get("login_notify", True) and user:
-                            await self.send_embed(user, data)
-                    except Forbidden:
-                        pass
-
-                    stats["cookies"] += 1
-                    if "errors" in data:
-                        stats["errors"] += 1
-                    for game, msg in data.items():
-                        if game == "errors":
-                            continue
-                        stats["per_game"].setdefault(game, 0)
-                        stats["per_game"][game] += 1
-                        if "Already claimed" in msg:
-                            stats["already"] += 1
-                        elif msg.startswith("✅"):
-                            stats["success"] += 1
+        entry = {
+            "user": user_id,
+            "date": today,
+            "attempt": attempt,
+            "due": due,
+            "games": data.retry_games(),
+            "reasons": sorted(set(reasons)),
+        }
+        self._retries[key] = entry
+        await self.config.retry_queue.set_raw(key, value=entry)
+
+    async def _retry_claim(self, key: str, entry: dict):
+        user_id = entry["user"]
+        roster = self._roster.get(str(user_id))
+        vault = await self.config.user_from_id(user_id).vault()
+        sealed = next((e for e in vault if e["id"] == key), None)
+        if roster is None or sealed is None:
+            # Auto login was turned off or the cookie removed since
+            self._retries.pop(key, None)
+            await self.config.retry_queue.clear_raw(key)
+            return
 
-                stats["users"] += 1
+        cookie = self._vault.open(sealed)
+        data = await self.claim_daily(cookie, games=entry["games"])
+        if not data.failed:
+            await self._checkpoint_cookie(cookie)
+        await self._defer_claim(user_id, cookie, data)
 
-            except Exception:
-                log.exception(f"Failed processing auto login for user {user_id}")
+        user = self.bot.get_user(user_id)
+        if user and roster["notify"] and data.claimed():
+            self._queue_login_dm(user, [data])
 
-        if channel:
-            try:
-                embed = self._build_summary_embed(stats)
-                await channel.send(embed=embed)
-            except Exception as e:
-                log.exception("Failed to send auto login summary embed: " + str(e))
+    @tasks.loop(minutes=1)
+    async def retry_task(self):
+        """Retry deferred claims that are due, dropping entries left over from another day."""
+        today = utcnow().date().isoformat()
+        now = time.time()
+        due = []
+        for key, entry in list(self._retries.items()):
+            if entry["date"] != today:
+                del self._retries[key]
+                await self.config.retry_queue.clear_raw(key)
+            elif entry["due"] <= now:
+                due.append((key, entry))
+        # A daily run owns the checkpoint set; its own pass claims these cookies anyway
+        if not due or self._task_lock.locked():
+            return
+
+        semaphore = asyncio.Semaphore(max(1, await self.config.max_concurrency()))
+
+        async def retry(key: str, entry: dict):
+            async with semaphore:
+                try:
+                    await self._retry_claim(key, entry)
+                except Exception:
+                    log.exception(
+                        f"Deferred claim retry failed for user {entry['user']}"
+                    )
+                    # Don't retry an entry that breaks the retry itself
+                    if self._retries.pop(key, None) is not None:
+                        await self.config.retry_queue.clear_raw(key)
+
+        async with self._task_lock:
+            await self._load_checkpoint()
+            await asyncio.gather(*(retry(key, entry) for key, entry in due))
+            await self._flush_checkpoint()
+
+    @retry_task.before_loop
+    async def before_retry(self):
+        await self.bot.wait_until_ready()
+
+    @health_task.before_loop
+    async def before_health(self):
+        await self.bot.wait_until_ready()
 
     @daily_task.before_loop
     async def before_daily(self):
@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from .vars import DEFERRED_RETRY_DELAYS, GAME_NAMES
+
+
+def censor_uid(uid: int) -> str:
+    """Hide all but the tail of a UID for messages sent to Discord."""
+    return "xxx" + str(uid)[3:]
+
+
+# Stands in for the claim of a cookie skipped because it is quarantined as dead
+QUARANTINED = "quarantined"
+
+
+class ClaimStatus(Enum):
+    SUCCESS = "success"
+    ALREADY = "already"
+    ERROR = "error"
+
+
+class RedeemStatus(Enum):
+    REDEEMED = "redeemed"
+    CLAIMED = "claimed"
+    EXPIRED = "expired"
+    ERROR = "error"
+
+
+@dataclass
+class ClaimResult:
+    """The outcome of a daily reward claim on one game account."""
+
+    __slots__ = ("game", "uid", "status", "detail", "reason")
+
+    game: str
+    uid: int
+    status: ClaimStatus
+    # Reward text on success, error message on failure
+    detail: str
+    # Failure class from utils.classify_claim_error, None unless status is ERROR
+    reason: Optional[str]
+
+    def __str__(self) -> str:
+        if self.status is ClaimStatus.ERROR:
+            return f"❌ {GAME_NAMES.get(self.game, self.game)}: {self.detail}"
+        if self.status is ClaimStatus.ALREADY:
+            return f"✅ Already claimed (UID {censor_uid(self.uid)})"
+        return f"✅ {self.detail} (UID {censor_uid(self.uid)})"
+
+
+@dataclass
+class CookieClaim:
+    """All claim results of one cookie, plus errors that stopped it entirely."""
+
+    __slots__ = ("claims", "errors", "reason")
+
+    claims: list[ClaimResult]
+    errors: list[str]
+    # Failure class of the error that stopped the whole cookie, if any
+    reason: Optional[str]
+
+    @classmethod
+    def failure(cls, error: str, reason: Optional[str] = None) -> "CookieClaim":
+        return cls([], [error], reason)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.errors) or any(
+            c.status is ClaimStatus.ERROR for c in self.claims
+        )
+
+    def error_lines(self) -> list[str]:
+        return self.errors + [
+            str(c) for c in self.claims if c.status is ClaimStatus.ERROR
+        ]
+
+    def claimed(self) -> list[ClaimResult]:
+        return [c for c in self.claims if c.status is not ClaimStatus.ERROR]
+
+    def retry_reasons(self) -> list[str]:
+        """Failure classes worth retrying later: one for the cookie, or one per failed game."""
+        if self.reason in DEFERRED_RETRY_DELAYS:
+            return [self.reason]
+        return [c.reason for c in self.claims if c.reason in DEFERRED_RETRY_DELAYS]
+
+    def retry_games(self) -> Optional[list[str]]:
+        """The games to retry, or None to retry the whole cookie."""
+        if self.reason in DEFERRED_RETRY_DELAYS:
+            return None
+        return [c.game for c in self.claims if c.reason in DEFERRED_RETRY_DELAYS]
+
+
+@dataclass
+class RedeemResult:
+    """The outcome of a code, settled on one game account or from the registry."""
+
+    __slots__ = ("code", "status", "game", "uid", "detail")
+
+    code: str
+    status: RedeemStatus
+    game: Optional[str]
+    uid: Optional[int]
+    # Redemption message on success, error message on failure
+    detail: str
+
+    @property
+    def redeemed(self) -> bool:
+        return self.status is RedeemStatus.REDEEMED
+
+    def __str__(self) -> str:
+        if self.status is RedeemStatus.EXPIRED:
+            return f"❌ Code `{self.code}` has expired"
+        label = f"{GAME_NAMES.get(self.game)} (UID {censor_uid(self.uid)})"
+        if self.status is RedeemStatus.CLAIMED:
+            return f"❌ Code `{self.code}` already redeemed for {label}"
+        if self.status is RedeemStatus.ERROR:
+            return f"❌ Code `{self.code}` redemption error for {label}: {self.detail}"
+        return f"🎁 Code `{self.code}` redeemed for {label}: {self.detail}"
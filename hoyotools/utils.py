@@ -0,0 +1,346 @@
+import asyncio
+import bisect
+import hashlib
+import random
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Callable, Hashable, NamedTuple
+
+import aiohttp
+import genshin
+
+from .vars import (
+    RATE_LIMIT_RETCODES,
+    REDEEM_CLAIMED_RETCODES,
+    REDEEM_EXPIRED_RETCODES,
+    REDEEM_INVALID_RETCODES,
+)
+
+
+class AccountInfo(NamedTuple):
+    """The parts of a genshin.GenshinAccount this cog needs, cheap to cache."""
+
+    game_biz: str
+    uid: int
+
+
+def cookie_hash(cookie: str) -> str:
+    """Return a stable fingerprint of a cookie, safe to use as a cache key."""
+    return hashlib.sha256(cookie.encode("utf-8")).hexdigest()
+
+
+def shard_of(user_id: int, shard_count: int) -> int:
+    """Map a user to one of ``shard_count`` shards, evenly and stably across restarts."""
+    digest = hashlib.sha256(str(user_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def is_geetest(error: BaseException) -> bool:
+    """Whether a failed HoYoLAB call was stopped by a captcha (geetest) challenge.
+
+    Daily claim captchas are raised as DailyGeetestTriggered with retcode 0,
+    so the exception type is checked as well as the retcode.
+    """
+    if isinstance(error, (genshin.DailyGeetestTriggered, genshin.GeetestError)):
+        return True
+    return getattr(error, "retcode", None) in genshin.constants.GEETEST_RETCODES
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether a failed HoYoLAB call is likely to succeed if tried again later."""
+    if isinstance(error, (asyncio.TimeoutError, aiohttp.ClientError)):
+        return True
+    return getattr(error, "retcode", None) in RATE_LIMIT_RETCODES
+
+
+def classify_claim_error(error: BaseException) -> str:
+    """Classify a failed claim as "ratelimit", "geetest", "transient", "invalid" or "error".
+
+    The first three are worth retrying later; the deferred retry queue keys
+    its backoff on them.
+    """
+    if getattr(error, "retcode", None) in RATE_LIMIT_RETCODES:
+        return "ratelimit"
+    if is_geetest(error):
+        return "geetest"
+    if is_transient(error):
+        return "transient"
+    if isinstance(error, genshin.InvalidCookies):
+        return "invalid"
+    return "error"
+
+
+def backoff_delay(base: float, attempt: int) -> float:
+    """Exponential backoff from ``base`` for the given attempt, with up to 50% jitter."""
+    delay = base * 2**attempt
+    return delay + random.uniform(0, delay / 2)
+
+
+def classify_redeem_error(error: BaseException) -> str:
+    """Classify a failed redemption as "claimed", "expired", "invalid" or "error"."""
+    retcode = getattr(error, "retcode", None)
+    msg = str(error).lower()
+    if retcode in REDEEM_CLAIMED_RETCODES or "already" in msg:
+        return "claimed"
+    if retcode in REDEEM_EXPIRED_RETCODES or "expired" in msg:
+        return "expired"
+    if retcode in REDEEM_INVALID_RETCODES or "invalid" in msg or "not found" in msg:
+        return "invalid"
+    return "error"
+
+
+class RateLimiter:
+    """A token bucket shared by all HoYoLAB requests, with adaptive backoff.
+
+    Requests take a token each and tokens refill at ``rate`` per second, up
+    to ``burst``. :meth:`backoff` pauses all requests for a cooldown and
+    halves the rate, and every successful request (:meth:`recover`) wins back
+    a little of the configured rate.
+    """
+
+    def __init__(self, rate: float):
+        self._lock = asyncio.Lock()
+        self._calls: "deque[float]" = deque()
+        self._paused_until = 0.0
+        self.throttled = 0
+        self.set_rate(rate)
+
+    def set_rate(self, rate: float):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    @property
+    def paused_for(self) -> float:
+        return max(0.0, self._paused_until - time.monotonic())
+
+    @property
+    def throughput(self) -> float:
+        """Requests per second over the last minute."""
+        cutoff = time.monotonic() - 60
+        while self._calls and self._calls[0] < cutoff:
+            self._calls.popleft()
+        return len(self._calls) / 60
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                if self.paused_for:
+                    await asyncio.sleep(self.paused_for)
+                    continue
+
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    self._calls.append(now)
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def backoff(self, cooldown: float):
+        self.throttled += 1
+        self.rate = max(self.base_rate / 16, self.rate / 2)
+        self._paused_until = max(self._paused_until, time.monotonic() + cooldown)
+
+    def recover(self):
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 50)
+
+
+class CooldownScheduler:
+    """Runs work for the same key one at a time, at least ``cooldown`` seconds apart.
+
+    Work for different keys runs concurrently.
+    """
+
+    def __init__(self, cooldown: float):
+        self.cooldown = cooldown
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+        self._last: dict[Hashable, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable):
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            wait = self._last.get(key, 0.0) + self.cooldown - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                yield
+            finally:
+                self._last[key] = time.monotonic()
+
+    def prune(self):
+        """Forget keys that are idle and past their cooldown."""
+        cutoff = time.monotonic() - self.cooldown
+        for key, last in list(self._last.items()):
+            lock = self._locks.get(key)
+            if last < cutoff and not (lock and lock.locked()):
+                self._last.pop(key, None)
+                self._locks.pop(key, None)
+
+
+class ClientPool:
+    """An LRU pool of genshin clients keyed by cookie fingerprint.
+
+    Reusing a client keeps its parsed cookies and the data genshin.py caches
+    per client (region, uids) across calls; connection reuse comes from the
+    shared connector the factory gives each client. Clients unused for ``idle_ttl``
+    seconds are dropped by :meth:`evict_idle`, and the least recently used
+    client is dropped whenever the pool grows past ``max_size``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[str], genshin.Client],
+        max_size: int,
+        idle_ttl: float,
+    ):
+        self._factory = factory
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        # fingerprint -> (client, last used), oldest first
+        self._clients: "OrderedDict[str, tuple[genshin.Client, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, cookie: str) -> genshin.Client:
+        key = cookie_hash(cookie)
+        entry = self._clients.pop(key, None)
+        client = entry[0] if entry else self._factory(cookie)
+        self._clients[key] = (client, time.monotonic())
+
+        while len(self._clients) > self.max_size:
+            self._clients.popitem(last=False)
+        return client
+
+    def discard(self, cookie: str):
+        self._clients.pop(cookie_hash(cookie), None)
+
+    def evict_idle(self) -> int:
+        """Drop clients that have been idle for too long, returns how many were dropped."""
+        cutoff = time.monotonic() - self.idle_ttl
+        evicted = 0
+        while self._clients:
+            key, (_, last_used) = next(iter(self._clients.items()))
+            if last_used >= cutoff:
+                break
+            del self._clients[key]
+            evicted += 1
+        return evicted
+
+    def clear(self):
+        self._clients.clear()
+
+
+class Histogram:
+    """Counts observations into fixed buckets, like a Prometheus histogram."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (inf if past the last bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms, keyed by name and labels.
+
+    :meth:`render` dumps everything in the Prometheus text exposition format.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counters: dict[str, dict[tuple, float]] = {}
+        self.gauges: dict[str, dict[tuple, float]] = {}
+        self.histograms: dict[str, dict[tuple, Histogram]] = {}
+
+    @staticmethod
+    def _key(labels: dict) -> tuple:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels):
+        series = self.counters.setdefault(name, {})
+        key = self._key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        self.gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def add(self, name: str, value: float, **labels):
+        series = self.gauges.setdefault(name, {})
+        key = self._key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        series = self.histograms.setdefault(name, {})
+        key = self._key(labels)
+        if key not in series:
+            series[key] = Histogram(self.buckets)
+        series[key].observe(value)
+
+    def value(self, name: str, **labels) -> float:
+        key = self._key(labels)
+        for store in (self.counters, self.gauges):
+            if key in store.get(name, {}):
+                return store[name][key]
+        return 0
+
+    def clear(self):
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    @staticmethod
+    def _labels(key: tuple, **extra) -> str:
+        pairs = list(key) + [(k, str(v)) for k, v in extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+    def render(self) -> str:
+        lines = []
+        for kind, store in (("counter", self.counters), ("gauge", self.gauges)):
+            for name, series in sorted(store.items()):
+                lines.append(f"# TYPE {name} {kind}")
+                for key, value in series.items():
+                    lines.append(f"{name}{self._labels(key)} {value:g}")
+
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f"# TYPE {name} histogram")
+            for key, hist in series.items():
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    le = self._labels(key, le=f"{bound:g}")
+                    lines.append(f"{name}_bucket{le} {cumulative}")
+                le = self._labels(key, le="+Inf")
+                lines.append(f"{name}_bucket{le} {hist.count}")
+                lines.append(f"{name}_sum{self._labels(key)} {hist.sum:g}")
+                lines.append(f"{name}_count{self._labels(key)} {hist.count}")
+
+        return "\n".join(lines) + "\n"
@@ -1,19 +1,77 @@
+from typing import NamedTuple
+
 import genshin
 
-SUPPORTED_GAMES = {
-    "hk4e_global": genshin.Game.GENSHIN,
-    "bh3_global": genshin.Game.HONKAI,
-    "hkrpg_global": genshin.Game.STARRAIL,
-    "nap_global": genshin.Game.ZZZ,
-}
-
-GAME_NAMES = {
-    "hk4e_global": "Genshin Impact",
-    "bh3_global": "Honkai Impact 3",
-    "hkrpg_global": "Honkai: Star Rail",
-    "nap_global": "Zenless Zone Zero",
-    "nxx_global": "Tears of Themis",
-}
+
+class GameAdapter(NamedTuple):
+    """A game HoyoTools knows about and what it can do for it.
+
+    To support a new game, add an adapter to GAME_ADAPTERS; everything else
+    is derived from it.
+    """
+
+    game: genshin.Game
+    name: str
+    # Account game_biz values, global first, then CN. Only the global biz is
+    # served: clients are created for HoYoLAB, the CN ones are only named
+    bizes: tuple[str, ...]
+    claim: bool
+    redeem: bool
+    # Default limit on concurrent claims (0 = unlimited), overridable by owners.
+    # Every game checks in on its own endpoint, so each gets its own budget
+    budget: int = 0
+
+
+GAME_ADAPTERS = (
+    GameAdapter(
+        genshin.Game.GENSHIN,
+        "Genshin Impact",
+        ("hk4e_global", "hk4e_cn"),
+        True,
+        True,
+        10,
+    ),
+    GameAdapter(
+        genshin.Game.HONKAI,
+        "Honkai Impact 3",
+        ("bh3_global", "bh3_cn"),
+        True,
+        False,
+        5,
+    ),
+    GameAdapter(
+        genshin.Game.STARRAIL,
+        "Honkai: Star Rail",
+        ("hkrpg_global", "hkrpg_cn"),
+        True,
+        True,
+        10,
+    ),
+    GameAdapter(
+        genshin.Game.ZZZ,
+        "Zenless Zone Zero",
+        ("nap_global", "nap_cn"),
+        True,
+        True,
+        10,
+    ),
+    GameAdapter(
+        genshin.Game.TOT,
+        "Tears of Themis",
+        ("nxx_global", "nxx_cn"),
+        True,
+        True,
+        3,
+    ),
+)
+
+GAME_ADAPTERS_BY_BIZ = {biz: a for a in GAME_ADAPTERS for biz in a.bizes}
+
+# game_biz -> genshin.Game for games with daily rewards / code redemption (global bizes only)
+SUPPORTED_GAMES = {a.bizes[0]: a.game for a in GAME_ADAPTERS if a.claim}
+REDEEM_GAMES = {a.bizes[0]: a.game for a in GAME_ADAPTERS if a.redeem}
+
+GAME_NAMES = {biz: a.name for biz, a in GAME_ADAPTERS_BY_BIZ.items()}
 
 FAIL_ICONS = [
     "https://cdn.project-mei.xyz/fail1-V4KLGf04bqVH.png",
@@ -25,3 +83,55 @@ SUCCESS_ICONS = [
     "https://cdn.project-mei.xyz/success1-Z0MJnJkuYY1O.png",
     "https://cdn.project-mei.xyz/success2-a3kIKu3nuYW7.png",
 ]
+
+# Pooled genshin clients: hard cap and seconds a client may sit unused
+CLIENT_POOL_SIZE = 512
+CLIENT_IDLE_TTL = 15 * 60
+# Open HTTP connections kept by the connector every pooled client shares
+HTTP_CONNECTION_LIMIT = 100
+
+# Seconds a cookie's cached game account list stays valid
+ACCOUNT_CACHE_TTL = 3 * 24 * 60 * 60
+
+# Retcodes HoYoLAB answers with when it is being called too often, and the
+# seconds every request is paused for after seeing one
+RATE_LIMIT_RETCODES = {-110}
+RATE_LIMIT_COOLDOWN = 30
+
+# Claimed cookies recorded in memory before the run checkpoint is written to Config
+CHECKPOINT_BATCH = 50
+
+# Login DM queue: max pending users and seconds between DMs
+DM_QUEUE_SIZE = 10000
+DM_INTERVAL = 0.5
+
+EMBED_MAX_FIELDS = 25
+
+# Seconds HoYoLAB requires between two code redemptions on the same game account
+REDEEM_COOLDOWN = 5.5
+
+# Redemption retcodes: already redeemed, expired and invalid (usually wrong game)
+REDEEM_CLAIMED_RETCODES = {-2017, -2018}
+REDEEM_EXPIRED_RETCODES = {-2001}
+REDEEM_INVALID_RETCODES = {-2003}
+
+# Seconds `cookie list` waits on each cookie's account lookup before showing a preview
+LIST_LOOKUP_TIMEOUT = 5
+
+# Minimum seconds between edits of a progress message
+PROGRESS_INTERVAL = 1.5
+
+# Histogram buckets (seconds) for latency metrics
+METRIC_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Consecutive invalid-cookie results before a cookie is quarantined as dead
+HEALTH_DEAD_AFTER = 2
+
+# Seconds between re-validations of a dead cookie, and how many to re-check per pass
+HEALTH_RECHECK_INTERVAL = 24 * 60 * 60
+HEALTH_RECHECK_BATCH = 20
+
+# Base delay (seconds) before a failed daily claim is retried later in the day, by
+# failure class; each further attempt doubles it
+DEFERRED_RETRY_DELAYS = {"transient": 5 * 60, "ratelimit": 15 * 60, "geetest": 60 * 60}
+DEFERRED_RETRY_ATTEMPTS = 4
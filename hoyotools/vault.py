@@ -0,0 +1,110 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from cryptography.fernet import Fernet, InvalidToken
+
+from .utils import cookie_hash
+
+log = logging.getLogger("red.raidensakura.hoyotools")
+
+
+class CookieVault:
+    """Encrypts cookies at rest and keeps a bounded LRU of decrypted ones.
+
+    Stored entries are ``{"id": fingerprint, "token": fernet token}``. Only
+    the fingerprint is ever compared, so a cookie is decrypted the first time
+    it is used and then served from memory until it is evicted for being
+    idle, pushed out by newer cookies, or purged.
+
+    Python strings cannot be overwritten in place, so purging drops every
+    reference to the plaintext and leaves the memory to the garbage collector.
+    """
+
+    def __init__(self, key: bytes, max_size: int, idle_ttl: float):
+        self._fernet = Fernet(key)
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        # fingerprint -> (cookie, last used), oldest first
+        self._plain: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+
+    @staticmethod
+    def load_key(path: Path) -> bytes:
+        """Read the bot-local key, creating it (readable by the bot user only) if missing."""
+        if path.exists():
+            return path.read_bytes().strip()
+        key = Fernet.generate_key()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+        return key
+
+    def __len__(self) -> int:
+        return len(self._plain)
+
+    def seal(self, cookie: str) -> dict:
+        return {
+            "id": cookie_hash(cookie),
+            "token": self._fernet.encrypt(cookie.encode("utf-8")).decode("ascii"),
+        }
+
+    def open(self, entry: dict) -> str:
+        """Return the plaintext of a stored entry.
+
+        Raises cryptography.fernet.InvalidToken if the entry was sealed with
+        another key.
+        """
+        key = entry["id"]
+        cached = self._plain.pop(key, None)
+        if cached:
+            cookie = cached[0]
+        else:
+            cookie = self._fernet.decrypt(entry["token"].encode("ascii")).decode()
+        self._plain[key] = (cookie, time.monotonic())
+
+        while len(self._plain) > self.max_size:
+            self._plain.popitem(last=False)
+        return cookie
+
+    def open_all(self, entries: list[dict]) -> list[str]:
+        """Decrypt entries in order, skipping (and logging) any that no longer decrypt."""
+        cookies = []
+        for entry in entries:
+            try:
+                cookies.append(self.open(entry))
+            except InvalidToken:
+                log.warning(
+                    f"Sealed cookie {entry['id'][:12]} does not decrypt with the "
+                    "current vault key, was vault.key replaced?"
+                )
+        return cookies
+
+    def can_open(self, entry: dict) -> bool:
+        """Whether an entry decrypts with the current key."""
+        if entry["id"] in self._plain:
+            return True
+        try:
+            self._fernet.decrypt(entry["token"].encode("ascii"))
+        except InvalidToken:
+            return False
+        return True
+
+    def forget(self, fingerprint: str):
+        self._plain.pop(fingerprint, None)
+
+    def evict_idle(self) -> int:
+        """Drop plaintexts that have been idle for too long, returns how many were dropped."""
+        cutoff = time.monotonic() - self.idle_ttl
+        evicted = 0
+        while self._plain:
+            key, (_, last_used) = next(iter(self._plain.items()))
+            if last_used >= cutoff:
+                break
+            del self._plain[key]
+            evicted += 1
+        return evicted
+
+    def purge(self):
+        self._plain.clear()
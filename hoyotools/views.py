@@ -125,15 +125,16 @@ class CookieManageView(ui.View):
             return
 
         idx = self.selected_index
-        cookies = list(await self.cog.config.user(self.ctx.author).cookies())
+        cookies = await self.cog.get_cookies(self.ctx.author.id)
         if idx < 0 or idx >= len(cookies):
             await interaction.response.send_message(
                 "Cookie not found (maybe removed already).", ephemeral=True
             )
             return
 
-        # removed = cookies.pop(idx)
-        await self.cog.config.user(self.ctx.author).cookies.set(cookies)
+        self.cog.forget_cookie(cookies.pop(idx))
+        await self.cog.set_cookies(self.ctx.author.id, cookies)
+        await self.cog.sync_roster(self.ctx.author.id)
         # disable view after action
         for item in self.children:
             item.disabled = True
@@ -162,14 +163,11 @@ class CookieManageView(ui.View):
 
         # build simple textual result
         lines = []
-        if data.get("errors"):
-            lines.append("Errors:\n" + "\n".join(data["errors"]))
-        for game, msg in data.items():
-            if game == "errors":
-                continue
-            lines.append(
-                f"{self.cog.GAME_NAMES.get(game, game) if hasattr(self.cog, 'GAME_NAMES') else game}: {msg}"
-            )
+        errors = data.error_lines()
+        if errors:
+            lines.append("Errors:\n" + "\n".join(errors))
+        for claim in data.claimed():
+            lines.append(f"{GAME_NAMES.get(claim.game, claim.game)}: {claim}")
 
         resp = "\n".join(lines) if lines else "No results."
         # keep the view open, but inform user
@@ -222,7 +220,7 @@ class CookieModal(ui.Modal):
         cookie = self.cookie.value.strip()
         user = interaction.user
 
-        cookies = await self.cog.config.user(user).cookies()
+        cookies = await self.cog.get_cookies(user.id)
         if cookie in cookies:
             await interaction.response.send_message(
                 "❌ This cookie is already saved.",
@@ -232,8 +230,7 @@ class CookieModal(ui.Modal):
 
         accounts = None
         try:
-            self.cog.client.set_cookies(cookie)
-            accounts = await self.cog.client.get_game_accounts()
+            accounts = await self.cog.get_accounts(cookie)
         except genshin.InvalidCookies:
             await interaction.response.send_message(
                 "❌ Invalid cookie.",
@@ -244,7 +241,8 @@ class CookieModal(ui.Modal):
             accounts = None
 
         cookies.append(cookie)
-        await self.cog.config.user(user).cookies.set(cookies)
+        await self.cog.set_cookies(user.id, cookies)
+        await self.cog.sync_roster(user.id)
 
         if accounts:
             lines = []
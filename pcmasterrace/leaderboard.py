@@ -0,0 +1,82 @@
+from bisect import bisect_left, insort
+
+from .utils import CATEGORIES
+
+
+class Leaderboard:
+    """
+    Server leaderboards for every category in CATEGORIES (CPU, GPU and Combined).
+    Each category is a list of (-score, user_id) pairs kept sorted with bisect, so the best score
+    comes first, members are inserted or removed without re-sorting, and a member's place is
+    found with a binary search. Members with equal scores share the same place.
+    """
+
+    def __init__(self):
+        # category -> [(-score, user_id), ...], best first
+        self._boards = {category: [] for category in CATEGORIES}
+        # user_id -> scores in CATEGORIES order
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, user_id):
+        return user_id in self._scores
+
+    def update(self, user_id, *scores):
+        """
+        Adds a member to the leaderboards, or moves them if they were already on it.
+        Args:
+            user_id (int): The ID of the member.
+            *scores (int): The member's scores, one per category in CATEGORIES order.
+        """
+
+        self.remove(user_id)
+        self._scores[user_id] = scores
+        for category, score in zip(CATEGORIES, scores):
+            insort(self._boards[category], (-score, user_id))
+
+    def remove(self, user_id):
+        """
+        Takes a member off the leaderboards. Does nothing if they are not on it.
+        Args:
+            user_id (int): The ID of the member.
+        """
+
+        scores = self._scores.pop(user_id, None)
+        if scores is None:
+            return
+        for category, score in zip(CATEGORIES, scores):
+            board = self._boards[category]
+            del board[bisect_left(board, (-score, user_id))]
+
+    def rank(self, user_id, category):
+        """
+        Looks up a member's place on one of the leaderboards.
+        Args:
+            user_id (int): The ID of a member on the leaderboards.
+            category (str): One of CATEGORIES.
+        Returns:
+            tuple: A tuple containing:
+                - int: The member's 1-based place.
+                - int: The member's score in that category.
+        """
+
+        score = self._scores[user_id][CATEGORIES.index(category)]
+        # (-score,) sorts before every (-score, user_id), so this counts the higher scores only
+        return bisect_left(self._boards[category], (-score,)) + 1, score
+
+    def ranking(self, category, start=0, end=None):
+        """
+        Slices one of the leaderboards.
+        Args:
+            category (str): One of CATEGORIES.
+            start (int, optional): The first place to include, 0-based. Defaults to 0.
+            end (int, optional): The place to stop before, 0-based. Defaults to the end.
+        Returns:
+            list: A list of (user_id, score) tuples, highest score first.
+        """
+
+        return [
+            (user_id, -score) for score, user_id in self._boards[category][start:end]
+        ]
@@ -8,6 +8,7 @@ from redbot.core import Config, commands
 from redbot.core.utils.views import SimpleMenu
 
 from .utils import (
+    CATEGORIES,
     CPU_SCORES_PATH,
     DEFAULT_COLOR,
     DEFAULT_WEIGHT,
@@ -17,11 +18,11 @@ from .utils import (
     draw_bar_graph,
     get_page,
 )
+from .leaderboard import Leaderboard
+from .scoretable import ScoreTable
+from .search import PartIndex
 from .views import ScoreView, UserScoreView
 
-with open(WEIGHTS_PATH, "r", encoding="utf-8") as f:
-    WEIGHTS = json.load(f)
-
 log = logging.getLogger("red.raidensakura.pcmasterrace")
 
 
@@ -36,18 +37,138 @@ class PCMasterRace(commands.Cog):
             self, identifier=1234567890, force_registration=True
         )
         self.config.register_user(**self.default_user)
+        # user_id -> {"cpu": ..., "gpu": ...} for every user with a complete combo
+        self.combos = {}
+        self.reload_scores()
 
+    def reload_scores(self):
+        """
+        (Re)load the CPU, GPU and weight files into columnar score tables and rebuild the part
+        name search indexes. Nothing derived from the score files is recomputed until the next
+        reload, and the parsed files are not kept around once the tables are built.
+        """
         with open(CPU_SCORES_PATH, "r", encoding="utf-8") as f:
-            self.cpu_scores = json.load(f)
+            cpu_scores = json.load(f)
         with open(GPU_SCORES_PATH, "r", encoding="utf-8") as f:
-            self.gpu_scores = json.load(f)
+            gpu_scores = json.load(f)
+        with open(WEIGHTS_PATH, "r", encoding="utf-8") as f:
+            self.weights = json.load(f)
+        self.cpu_table = ScoreTable(cpu_scores, self.weights)
+        self.gpu_table = ScoreTable(gpu_scores, self.weights)
+        self.cpu_index = PartIndex(self.cpu_table)
+        self.gpu_index = PartIndex(self.gpu_table)
+        # guild_id -> Leaderboard, built on first use from the scores above
+        self.leaderboards = {}
 
     async def cog_load(self):
         await self.migrate_user_combos()
+        await self.load_combos()
 
     async def red_delete_data_for_user(self, *, requester, user_id: int) -> None:
         """Remove the user's saved CPU and GPU selections."""
         await self.config.user_from_id(user_id).clear()
+        self.index_combo(user_id, None, None)
+
+    async def load_combos(self):
+        """
+        Builds the in-memory index of complete combos from a single bulk read of the user config.
+        """
+        self.combos = {}
+        for user_id, data in (await self.config.all_users()).items():
+            self.index_combo(user_id, data.get("cpu"), data.get("gpu"))
+
+    def index_combo(self, user_id, cpu, gpu):
+        """
+        Keeps the in-memory combo index in sync with a user's saved parts. Must be called
+        whenever a user's CPU or GPU is changed in the config.
+        Args:
+            user_id (int): The ID of the user whose parts changed.
+            cpu (str or None): The user's saved CPU, if any.
+            gpu (str or None): The user's saved GPU, if any.
+        """
+
+        if cpu and gpu:
+            self.combos[user_id] = {"cpu": cpu, "gpu": gpu}
+        else:
+            self.combos.pop(user_id, None)
+
+        scores = None
+        for guild_id, board in self.leaderboards.items():
+            guild = self.bot.get_guild(guild_id)
+            if user_id not in self.combos or not guild or not guild.get_member(user_id):
+                board.remove(user_id)
+                continue
+            scores = scores or self.combo_scores(cpu, gpu)
+            board.update(user_id, *scores)
+
+    def part_score(self, name, table, index):
+        """
+        Synchronous counterpart of fetch_cpu_score/fetch_gpu_score that never prompts: names that
+        are not full part names take the first match of the search index.
+        Args:
+            name (str): The part name to score.
+            table (ScoreTable): The score table to read the score from.
+            index (PartIndex): The search index built over the same part names.
+        Returns:
+            int: The weighted score of the part, or 0 if no match is found.
+        """
+
+        if name not in table:
+            matches = index.match(name)
+            if not matches:
+                return 0
+            name = matches[0]
+        return table.score(name)
+
+    def combo_scores(self, cpu, gpu):
+        """
+        Scores a CPU/GPU combo for every leaderboard category.
+        Args:
+            cpu (str): The CPU name.
+            gpu (str): The GPU name.
+        Returns:
+            tuple: The CPU, GPU and combined scores, in CATEGORIES order.
+        """
+
+        cpu_score = self.part_score(cpu, self.cpu_table, self.cpu_index)
+        gpu_score = self.part_score(gpu, self.gpu_table, self.gpu_index)
+        return cpu_score, gpu_score, self.combined_score(cpu_score, gpu_score)
+
+    async def get_leaderboard(self, guild):
+        """
+        Returns the guild's leaderboards, building them from the combo index the first time.
+        Afterwards they are kept up to date by index_combo and the member listeners, and only
+        rebuilt after the score files are reloaded.
+        Args:
+            guild (discord.Guild): The guild to get the leaderboards of.
+        Returns:
+            Leaderboard: The guild's leaderboards.
+        """
+
+        board = self.leaderboards.get(guild.id)
+        if board is None:
+            board = Leaderboard()
+            for member, data in await self.get_all_users(guild):
+                board.update(member.id, *self.combo_scores(data["cpu"], data["gpu"]))
+            self.leaderboards[guild.id] = board
+        return board
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        board = self.leaderboards.get(member.guild.id)
+        data = self.combos.get(member.id)
+        if board is not None and data:
+            board.update(member.id, *self.combo_scores(data["cpu"], data["gpu"]))
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        board = self.leaderboards.get(member.guild.id)
+        if board is not None:
+            board.remove(member.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.leaderboards.pop(guild.id, None)
 
     async def migrate_user_combos(self):
         # Migrate user configs: convert saved CPU/GPU strings to full part names if needed
@@ -59,11 +180,11 @@ class PCMasterRace(commands.Cog):
             new_cpu = None
             new_gpu = None
             if cpu:
-                match = await self.regex_match(cpu, self.cpu_scores.keys())
+                match = await self.regex_match(cpu, self.cpu_index)
                 if match and match != cpu:
                     new_cpu = match
             if gpu:
-                match = await self.regex_match(gpu, self.gpu_scores.keys())
+                match = await self.regex_match(gpu, self.gpu_index)
                 if match and match != gpu:
                     new_gpu = match
             if new_cpu or new_gpu:
@@ -90,54 +211,20 @@ class PCMasterRace(commands.Cog):
         3. Case-insensitive regex match for whole words or numbers (e.g., "3080" matches "RTX 3080", "i7-12700K" matches "Intel Core i7-12700K").
         4. Case-insensitive substring match (in either direction).
         If return_options is True and multiple matches are found, prompts the user to select one (requires ctx).
+        The tiers are answered by a PartIndex; pass `self.cpu_index`/`self.gpu_index` to reuse the prebuilt ones.
         Args:
             name (str): The name to match against the candidates.
-            candidates (Iterable[str]): A collection of candidate strings to search.
+            candidates (PartIndex or Iterable[str]): A collection of candidate strings to search.
             return_options (bool): If True, return all matches and prompt user if multiple.
             ctx: The command context (required if return_options is True and multiple matches).
         Returns:
             str or None: The best matching candidate string, or None if no match is found.
         """
 
-        def normalize(s):
-            return re.sub(r"[\W_]+", "", s).lower()
+        if not isinstance(candidates, PartIndex):
+            candidates = PartIndex(candidates)
 
-        name_norm = normalize(name)
-        candidates = list(candidates)
-        matches = []
-
-        # 1. Case-insensitive exact match
-        for key in candidates:
-            if key.lower() == name.lower():
-                matches.append(key)
-        if matches:
-            if return_options and len(matches) > 1 and ctx:
-                return await self._prompt_user_choice(ctx, matches, name)
-            return matches[0]
-
-        # 2. Normalized (alphanumeric, no spaces) match
-        for key in candidates:
-            if normalize(key) == name_norm:
-                matches.append(key)
-        if matches:
-            if return_options and len(matches) > 1 and ctx:
-                return await self._prompt_user_choice(ctx, matches, name)
-            return matches[0]
-
-        # 3. Regex: match as a whole word or model code
-        pattern = re.compile(rf"\b{re.escape(name)}\b", re.IGNORECASE)
-        for key in candidates:
-            if pattern.search(key):
-                matches.append(key)
-        if matches:
-            if return_options and len(matches) > 1 and ctx:
-                return await self._prompt_user_choice(ctx, matches, name)
-            return matches[0]
-
-        # 4. Substring match (in either direction)
-        for key in candidates:
-            if name.lower() in key.lower() or key.lower() in name.lower():
-                matches.append(key)
+        matches = candidates.match(name)
         if matches:
             if return_options and len(matches) > 1 and ctx:
                 return await self._prompt_user_choice(ctx, matches, name)
@@ -171,43 +258,48 @@ class PCMasterRace(commands.Cog):
             await ctx.send("No valid selection made. Cancelling.")
             return None
 
+    async def lookup_part(self, name, table, index):
+        """
+        Resolves a part name to its full name in a weighted score table.
+        Names that are already full part names (such as the ones saved in user configs) are
+        returned as is, anything else goes through regex_match.
+        Args:
+            name (str): The part name to resolve.
+            table (ScoreTable): The score table to resolve against.
+            index (PartIndex): The search index built over the same part names.
+        Returns:
+            str or None: The full part name, or None if no match is found.
+        """
+
+        if name in table:
+            return name
+        return await self.regex_match(name, index)
+
     async def fetch_all_gpu_scores(self, gpu_name: str = ""):
         """
-        Fetches and calculates weighted GPU scores for all GPUs or a specific GPU.
-        If a GPU name is provided, attempts to match it using regex and returns the weighted scores
+        Fetches weighted GPU scores for all GPUs or a specific GPU.
+        If a GPU name is provided, resolves it with lookup_part and returns the weighted scores
         for the matched GPU. If no match is found, returns an empty dictionary. If no GPU name is
         provided, returns weighted scores for all GPUs.
-        Each GPU's scores are calculated using predefined weights, and the weighted total is included
-        in the result.
+        Scores are read from the score table built by reload_scores, with the
+        weighted total included in the result.
         Args:
             gpu_name (str, optional): The name of the GPU to fetch scores for. Defaults to "".
         Returns:
             dict: A dictionary mapping GPU names to their score details, including the weighted score.
         """
 
-        scores = {}
-        items = self.gpu_scores.items()
-        if gpu_name:
-            match = await self.regex_match(gpu_name, self.gpu_scores.keys())
-            if match:
-                items = [(match, self.gpu_scores[match])]
-            else:
-                return {}
-        for name, data in items:
-            weighted = 0
-            score_details = {}
-            for score_name, value in data.items():
-                weight = WEIGHTS.get(score_name, DEFAULT_WEIGHT)
-                score_details[score_name] = value
-                weighted += value * weight
-            score_details["weighted"] = int(round(weighted))
-            scores[name] = score_details
-        return scores
+        if not gpu_name:
+            return {name: self.gpu_table.details(name) for name in self.gpu_table}
+        match = await self.lookup_part(gpu_name, self.gpu_table, self.gpu_index)
+        if not match:
+            return {}
+        return {match: self.gpu_table.details(match)}
 
     async def fetch_all_cpu_scores(self, cpu_name: str = ""):
         """
-        Fetches and calculates weighted CPU scores for all CPUs or a specific CPU.
-        If a CPU name is provided, attempts to match it against known CPU names using regex.
+        Fetches weighted CPU scores for all CPUs or a specific CPU from the precomputed table.
+        If a CPU name is provided, resolves it against known CPU names with lookup_part.
         Returns the weighted scores for the matched CPU if found, otherwise returns an empty dictionary.
         If no CPU name is provided, returns weighted scores for all CPUs.
         Args:
@@ -216,30 +308,18 @@ class PCMasterRace(commands.Cog):
             dict: A dictionary mapping CPU names to their score details, including individual scores and the weighted total.
         """
 
-        scores = {}
-        items = self.cpu_scores.items()
-        if cpu_name:
-            match = await self.regex_match(cpu_name, self.cpu_scores.keys())
-            if match:
-                items = [(match, self.cpu_scores[match])]
-            else:
-                return {}
-        for name, data in items:
-            weighted = 0
-            score_details = {}
-            for score_name, value in data.items():
-                weight = WEIGHTS.get(score_name, DEFAULT_WEIGHT)
-                score_details[score_name] = value
-                weighted += value * weight
-            score_details["weighted"] = int(round(weighted))
-            scores[name] = score_details
-        return scores
+        if not cpu_name:
+            return {name: self.cpu_table.details(name) for name in self.cpu_table}
+        match = await self.lookup_part(cpu_name, self.cpu_table, self.cpu_index)
+        if not match:
+            return {}
+        return {match: self.cpu_table.details(match)}
 
     async def fetch_gpu_score(self, gpu_name):
         """
         Calculates and returns the weighted score for a given GPU name.
-        This method attempts to match the provided GPU name against known GPU scores.
-        If a match is found, it computes a weighted sum of the GPU's scores using predefined weights.
+        This method resolves the provided GPU name against known GPU scores with lookup_part.
+        If a match is found, it returns the GPU's weighted sum precomputed by reload_scores.
         If no match is found, it returns 0.
         Args:
             gpu_name (str): The name of the GPU to fetch the score for.
@@ -247,21 +327,16 @@ class PCMasterRace(commands.Cog):
             int: The weighted score for the GPU, or 0 if no match is found.
         """
 
-        match = await self.regex_match(gpu_name, self.gpu_scores.keys())
+        match = await self.lookup_part(gpu_name, self.gpu_table, self.gpu_index)
         if match:
-            gpu_data = self.gpu_scores[match]
-            weighted = 0
-            for score_name, value in gpu_data.items():
-                weight = WEIGHTS.get(score_name, DEFAULT_WEIGHT)
-                weighted += value * weight
-            return int(round(weighted))
+            return self.gpu_table.score(match)
         return 0
 
     async def fetch_cpu_score(self, cpu_name):
         """
         Calculates and returns the weighted CPU score for a given CPU name.
-        This method attempts to match the provided CPU name against known CPU scores.
-        If a match is found, it computes a weighted sum of the CPU's scores using predefined weights.
+        This method resolves the provided CPU name against known CPU scores with lookup_part.
+        If a match is found, it returns the CPU's weighted sum precomputed by reload_scores.
         If no match is found, it returns 0.
         Args:
             cpu_name (str): The name of the CPU to fetch the score for.
@@ -269,14 +344,9 @@ class PCMasterRace(commands.Cog):
             int: The weighted CPU score if a match is found, otherwise 0.
         """
 
-        match = await self.regex_match(cpu_name, self.cpu_scores.keys())
+        match = await self.lookup_part(cpu_name, self.cpu_table, self.cpu_index)
         if match:
-            cpu_data = self.cpu_scores[match]
-            weighted = 0
-            for score_name, value in cpu_data.items():
-                weight = WEIGHTS.get(score_name, DEFAULT_WEIGHT)
-                weighted += value * weight
-            return int(round(weighted))
+            return self.cpu_table.score(match)
         return 0
 
     def combined_score(self, cpu_score, gpu_score, cpu_weight=0.4, gpu_weight=0.6):
@@ -305,6 +375,8 @@ class PCMasterRace(commands.Cog):
     async def get_all_users(self, guild):
         """
         Asynchronously retrieves all users from the guild who have both CPU and GPU data configured.
+        Served from the in-memory combo index, so it only goes through users who submitted a
+        combo instead of reading every user's config.
         Args:
             guild (discord.Guild): The guild from which to retrieve members.
         Returns:
@@ -313,13 +385,10 @@ class PCMasterRace(commands.Cog):
         """
 
         users = []
-        for user_id in await self.config.all_users():
+        for user_id, data in self.combos.items():
             member = guild.get_member(user_id)
-            if not member:
-                continue
-            data = await self.config.user_from_id(user_id).all()
-            if data["cpu"] and data["gpu"]:
-                users.append((member, data))
+            if member:
+                users.append((member, dict(data)))
         return users
 
     @pcmasterrace.group(name="chart")
@@ -330,26 +399,13 @@ class PCMasterRace(commands.Cog):
     @chart.command(name="parts")
     async def chart_parts(self, ctx):
         """List all GPU and CPU scores as a bar graph image with interactive buttons and pagination (embed only)."""
-        if not self.gpu_scores and not self.cpu_scores:
+        if not self.gpu_table and not self.cpu_table:
             await ctx.send("No GPU or CPU scores set.")
             return
 
-        # Prepare separate dicts for GPU and CPU weighted scores
-        gpu_weighted_scores = {}
-        cpu_weighted_scores = {}
-
-        for name in self.gpu_scores.keys():
-            gpu_weighted_scores[name] = await self.fetch_gpu_score(name)
-        for name in self.cpu_scores.keys():
-            cpu_weighted_scores[name] = await self.fetch_cpu_score(name)
-
-        # Sort GPU and CPU scores by weighted score, highest first
-        gpu_weighted_scores = dict(
-            sorted(gpu_weighted_scores.items(), key=lambda x: x[1], reverse=True)
-        )
-        cpu_weighted_scores = dict(
-            sorted(cpu_weighted_scores.items(), key=lambda x: x[1], reverse=True)
-        )
+        # GPU and CPU weighted scores, already ranked highest first
+        gpu_weighted_scores = self.gpu_table.top()
+        cpu_weighted_scores = self.cpu_table.top()
 
         view = ScoreView(ctx, gpu_weighted_scores, cpu_weighted_scores)
         await self.send_view(ctx, view, cpu_weighted_scores)
@@ -359,28 +415,21 @@ class PCMasterRace(commands.Cog):
         """
         Show a bar graph comparing all server members' builds (CPU+GPU combos).
         """
-        users = await self.get_all_users(ctx.guild)
-        if not users:
+        board = await self.get_leaderboard(ctx.guild)
+        if not board:
             await ctx.send("No users have submitted combos.")
             return
 
-        cpu_scores = {}
-        gpu_scores = {}
-        combined_scores = {}
-
-        for member, data in users:
-            cpu_score = await self.fetch_cpu_score(data["cpu"])
-            gpu_score = await self.fetch_gpu_score(data["gpu"])
-            combo_score = self.combined_score(cpu_score, gpu_score)
-            cpu_scores[member.display_name] = cpu_score
-            gpu_scores[member.display_name] = gpu_score
-            combined_scores[member.display_name] = combo_score
-
-        cpu_scores = dict(sorted(cpu_scores.items(), key=lambda x: x[1], reverse=True))
-        gpu_scores = dict(sorted(gpu_scores.items(), key=lambda x: x[1], reverse=True))
-        combined_scores = dict(
-            sorted(combined_scores.items(), key=lambda x: x[1], reverse=True)
-        )
+        # Leaderboards are already sorted, only resolve display names
+        rankings = []
+        for category in CATEGORIES:
+            scores = {}
+            for user_id, score in board.ranking(category):
+                member = ctx.guild.get_member(user_id)
+                if member:
+                    scores[member.display_name] = score
+            rankings.append(scores)
+        cpu_scores, gpu_scores, combined_scores = rankings
 
         view = UserScoreView(ctx, cpu_scores, gpu_scores, combined_scores)
         await self.send_view(ctx, view, cpu_scores)
@@ -414,6 +463,26 @@ class PCMasterRace(commands.Cog):
         sent = await ctx.send(embed=embed, view=view, files=files)
         view.message = sent
 
+    @pcmasterrace.command(name="rank")
+    async def rank(self, ctx, member: discord.Member = None):
+        """Show your or another member's place on the server leaderboards."""
+        member = member or ctx.author
+        board = await self.get_leaderboard(ctx.guild)
+        if member.id not in board:
+            await ctx.send(f"{member.display_name} has not submitted a combo.")
+            return
+
+        lines = []
+        for category in CATEGORIES:
+            place, score = board.rank(member.id, category)
+            lines.append(f"**{category}:** #{place} of {len(board)} (`{score}`)")
+        embed = discord.Embed(
+            title=f"{member.display_name}'s Server Rank",
+            description="\n".join(lines),
+            color=await ctx.embed_color() or DEFAULT_COLOR,
+        )
+        await ctx.send(embed=embed)
+
     @pcmasterrace.group(name="set")
     async def set_cmd(self, ctx):
         """Set various settings for this cog."""
@@ -438,6 +507,7 @@ class PCMasterRace(commands.Cog):
             return
         if combo.strip().lower() == "remove":
             await self.config.user(ctx.author).set(self.default_user)
+            self.index_combo(ctx.author.id, None, None)
             await ctx.send("Your combo has been removed.")
             return
 
@@ -452,10 +522,10 @@ class PCMasterRace(commands.Cog):
         gpu_name = parts[1].strip()
 
         matched_cpu = await self.regex_match(
-            cpu_name, self.cpu_scores.keys(), return_options=True, ctx=ctx
+            cpu_name, self.cpu_index, return_options=True, ctx=ctx
         )
         matched_gpu = await self.regex_match(
-            gpu_name, self.gpu_scores.keys(), return_options=True, ctx=ctx
+            gpu_name, self.gpu_index, return_options=True, ctx=ctx
         )
 
         if not matched_cpu:
@@ -470,6 +540,7 @@ class PCMasterRace(commands.Cog):
 
         await self.config.user(ctx.author).cpu.set(matched_cpu)
         await self.config.user(ctx.author).gpu.set(matched_gpu)
+        self.index_combo(ctx.author.id, matched_cpu, matched_gpu)
 
         embed = build_combo_embed(
             self,
@@ -492,11 +563,12 @@ class PCMasterRace(commands.Cog):
             return
         if cpu.strip().lower() == "remove":
             await self.config.user(ctx.author).cpu.set(None)
+            self.index_combo(ctx.author.id, None, None)
             await ctx.send("Your CPU has been removed from your combo.")
             return
 
         matched = await self.regex_match(
-            cpu, self.cpu_scores.keys(), return_options=True, ctx=ctx
+            cpu, self.cpu_index, return_options=True, ctx=ctx
         )
         if not matched:
             await ctx.send(f"Could not find CPU score for `{cpu}`.")
@@ -511,6 +583,7 @@ class PCMasterRace(commands.Cog):
             gpu_scores = await self.fetch_all_gpu_scores(gpu_name)
 
         await self.config.user(ctx.author).cpu.set(matched)
+        self.index_combo(ctx.author.id, matched, gpu_name)
 
         embed = build_combo_embed(
             self,
@@ -533,11 +606,12 @@ class PCMasterRace(commands.Cog):
             return
         if gpu.strip().lower() == "remove":
             await self.config.user(ctx.author).gpu.set(None)
+            self.index_combo(ctx.author.id, None, None)
             await ctx.send("Your GPU has been removed from your combo.")
             return
 
         matched = await self.regex_match(
-            gpu, self.gpu_scores.keys(), return_options=True, ctx=ctx
+            gpu, self.gpu_index, return_options=True, ctx=ctx
         )
         if not matched:
             await ctx.send(f"Could not find GPU score for `{gpu}`.")
@@ -551,6 +625,7 @@ class PCMasterRace(commands.Cog):
             cpu_scores = await self.fetch_all_cpu_scores(cpu_name)
 
         await self.config.user(ctx.author).gpu.set(matched)
+        self.index_combo(ctx.author.id, cpu_name, matched)
 
         embed = build_combo_embed(
             self,
@@ -587,18 +662,28 @@ class PCMasterRace(commands.Cog):
         )
         await ctx.send(embed=embed)
 
+    @pcmasterrace.command(name="reload")
+    @commands.is_owner()
+    async def reload(self, ctx):
+        """Reload the CPU, GPU and weight score files."""
+        try:
+            self.reload_scores()
+        except (OSError, ValueError) as e:
+            await ctx.send(f"Failed to reload scores: {e}")
+            return
+        await ctx.send(
+            f"Reloaded {len(self.cpu_table)} CPU and {len(self.gpu_table)} GPU scores "
+            f"with {len(self.weights)} weights."
+        )
+
     @pcmasterrace.command(name="wiki")
     async def wiki(self, ctx):
         """
         Show information about how scores and combos work (multi-page).
         """
         # Page 1: Score calculation, types, weights, formula
-        cpu_score_types = set()
-        gpu_score_types = set()
-        for cpu in self.cpu_scores.values():
-            cpu_score_types.update(cpu.keys())
-        for gpu in self.gpu_scores.values():
-            gpu_score_types.update(gpu.keys())
+        cpu_score_types = self.cpu_table.metrics
+        gpu_score_types = self.gpu_table.metrics
 
         page1 = (
             "**How scores are calculated:**\n"
@@ -607,11 +692,11 @@ class PCMasterRace(commands.Cog):
             "**CPU Score Types & Weights:**\n"
         )
         for score_type in cpu_score_types:
-            weight = WEIGHTS.get(score_type, DEFAULT_WEIGHT)
+            weight = self.weights.get(score_type, DEFAULT_WEIGHT)
             page1 += f"- `{score_type}`: weight = `{weight}`\n"
         page1 += "\n**GPU Score Types & Weights:**\n"
         for score_type in gpu_score_types:
-            weight = WEIGHTS.get(score_type, DEFAULT_WEIGHT)
+            weight = self.weights.get(score_type, DEFAULT_WEIGHT)
             page1 += f"- `{score_type}`: weight = `{weight}`\n"
         page1 += (
             "\n**Combo Score Formula:**\n"
@@ -624,8 +709,32 @@ class PCMasterRace(commands.Cog):
             "This formula gives more weight to the lower-performing part, reflecting real-world bottlenecks.\n"
         )
 
-        # Page 2: How to use, commands, data sources
-        page2 = (
+        # Page 2: Score database statistics
+        page2 = ""
+        for label, table in (("CPU", self.cpu_table), ("GPU", self.gpu_table)):
+            page2 += f"**{label} Database:** `{len(table)}` parts\n"
+            for name, score in table.top(3).items():
+                page2 += f"{table.rank(name)}. {name}: `{score}`\n"
+            for score_type, stats in table.metric_stats().items():
+                best, best_score = next(iter(table.top(1, score_type).items()))
+                page2 += (
+                    f"- `{score_type}`: `{stats['count']}` parts, "
+                    f"min `{stats['min']}`, median `{stats['median']:g}`, "
+                    f"max `{stats['max']}` ({best})\n"
+                )
+            page2 += "\n"
+
+        combo = self.combos.get(ctx.author.id)
+        if combo:
+            cpu_score, gpu_score, _ = self.combo_scores(combo["cpu"], combo["gpu"])
+            page2 += (
+                f"**Your combo:** your CPU beats "
+                f"`{self.cpu_table.percentile(cpu_score):.1f}%` of CPUs and your GPU beats "
+                f"`{self.gpu_table.percentile(gpu_score):.1f}%` of GPUs in the database.\n"
+            )
+
+        # Page 3: How to use, commands, data sources
+        page3 = (
             "**How to add your combo:**\n"
             "Use the command:\n"
             "`{prefix}pcmr set combo <CPU Name> + <GPU Name>`\n"
@@ -649,15 +758,20 @@ class PCMasterRace(commands.Cog):
 
         embeds = [
             discord.Embed(
-                title="PCMasterRace Wiki (Page 1/2)",
+                title="PCMasterRace Wiki (Page 1/3)",
                 description=page1,
                 color=await ctx.embed_color() or DEFAULT_COLOR,
             ),
             discord.Embed(
-                title="PCMasterRace Wiki (Page 2/2)",
+                title="PCMasterRace Wiki (Page 2/3)",
                 description=page2,
                 color=await ctx.embed_color() or DEFAULT_COLOR,
             ),
+            discord.Embed(
+                title="PCMasterRace Wiki (Page 3/3)",
+                description=page3,
+                color=await ctx.embed_color() or DEFAULT_COLOR,
+            ),
         ]
         await SimpleMenu(embeds, use_select_menu=True).start(ctx)
 
@@ -694,12 +808,10 @@ class PCMasterRace(commands.Cog):
             gpu_score = await self.fetch_gpu_score(data["gpu"])
             combo_score = self.combined_score(cpu_score, gpu_score)
             cpu_full = (
-                await self.regex_match(data["cpu"], self.cpu_scores.keys())
-                or data["cpu"]
+                await self.regex_match(data["cpu"], self.cpu_index) or data["cpu"]
             )
             gpu_full = (
-                await self.regex_match(data["gpu"], self.gpu_scores.keys())
-                or data["gpu"]
+                await self.regex_match(data["gpu"], self.gpu_index) or data["gpu"]
             )
             user_data.append(
                 {
@@ -0,0 +1,172 @@
+import numpy as np
+
+from .utils import DEFAULT_WEIGHT
+
+
+class ScoreTable:
+    """
+    Columnar, read-only view of a score database such as cpu.json or gpu.json.
+    Instead of one dict per part, every score type is a column of a single 2D array with one row
+    per part, next to a boolean mask of which scores a part actually has. Weighted scores,
+    rankings and percentiles are computed for the whole table at once when it is built, so
+    lookups and leaderboards only index into precomputed arrays.
+    Args:
+        scores (dict): A dictionary mapping part names to their benchmark scores.
+        weights (dict): A dictionary mapping score types to their weight.
+    """
+
+    def __init__(self, scores, weights):
+        self.names = list(scores)
+        self._rows = {name: row for row, name in enumerate(self.names)}
+
+        # Score types in the order they first appear, matching the order of the source file
+        self.metrics = list(dict.fromkeys(m for data in scores.values() for m in data))
+        columns = {metric: col for col, metric in enumerate(self.metrics)}
+        integral = all(
+            isinstance(value, int)
+            for data in scores.values()
+            for value in data.values()
+        )
+
+        shape = (len(self.names), len(self.metrics))
+        self.values = np.zeros(shape, dtype=np.int64 if integral else np.float64)
+        self.mask = np.zeros(shape, dtype=bool)
+        # Each part's own score type order, shared between parts listing them the same way
+        self._layouts = []
+        layout_ids = {}
+        self._layout = np.zeros(len(self.names), dtype=np.int32)
+        for row, data in enumerate(scores.values()):
+            layout = tuple(columns[metric] for metric in data)
+            if layout not in layout_ids:
+                layout_ids[layout] = len(self._layouts)
+                self._layouts.append(layout)
+            self._layout[row] = layout_ids[layout]
+            for metric, value in data.items():
+                self.values[row, columns[metric]] = value
+                self.mask[row, columns[metric]] = True
+
+        self.weights = np.array(
+            [weights.get(metric, DEFAULT_WEIGHT) for metric in self.metrics],
+            dtype=np.float64,
+        )
+        # Missing scores are stored as 0 and add nothing to the sum; np.rint rounds half to
+        # even like round(), so the totals match the per-part dict calculation
+        self.weighted = np.rint((self.values * self.weights).sum(axis=1)).astype(
+            np.int64
+        )
+
+        # Highest weighted score first; the stable sort keeps file order between equal scores
+        self.order = np.argsort(-self.weighted, kind="stable")
+        self.ranks = np.empty(len(self.names), dtype=np.int64)
+        self.ranks[self.order] = np.arange(1, len(self.names) + 1)
+        self._sorted = np.sort(self.weighted)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def details(self, name):
+        """
+        Returns the score details of a part in the same shape and key order as the source file.
+        Args:
+            name (str): The full part name.
+        Returns:
+            dict: The part's scores, keyed by score type, plus its weighted total under "weighted".
+        """
+
+        row = self._rows[name]
+        details = {
+            self.metrics[col]: self.values[row, col].item()
+            for col in self._layouts[self._layout[row]]
+        }
+        details["weighted"] = int(self.weighted[row])
+        return details
+
+    def score(self, name):
+        """
+        Returns the weighted score of a part.
+        Args:
+            name (str): The full part name.
+        Returns:
+            int: The weighted score.
+        """
+
+        return int(self.weighted[self._rows[name]])
+
+    def rank(self, name):
+        """
+        Returns the leaderboard position of a part among all parts in the table.
+        Args:
+            name (str): The full part name.
+        Returns:
+            int: The 1-based rank, 1 being the highest weighted score.
+        """
+
+        return int(self.ranks[self._rows[name]])
+
+    def percentile(self, score):
+        """
+        Calculates the percentage of parts in the table with a lower weighted score.
+        Args:
+            score (int or float): The weighted score to place among the parts.
+        Returns:
+            float: The percentile between 0 and 100, or 0 if the table is empty.
+        """
+
+        if not len(self._sorted):
+            return 0.0
+        below = np.searchsorted(self._sorted, score, side="left")
+        return float(below * 100 / len(self._sorted))
+
+    def top(self, k=None, metric=None):
+        """
+        Returns the best parts of the table, by weighted score or by a single score type.
+        Args:
+            k (int, optional): How many parts to return. Defaults to all of them.
+            metric (str, optional): The score type to rank by. Parts without that score are left
+                out. Defaults to the weighted score.
+        Returns:
+            dict: A dictionary mapping part names to their score, highest first.
+        """
+
+        if metric is None:
+            order = self.order if k is None else self.order[:k]
+            return {self.names[row]: int(self.weighted[row]) for row in order}
+
+        if metric not in self.metrics:
+            return {}
+        col = self.metrics.index(metric)
+        rows = np.flatnonzero(self.mask[:, col])
+        column = self.values[rows, col]
+        if k is not None and k < len(rows):
+            # Partition out the k best before sorting only those
+            best = np.argpartition(-column, k - 1)[:k]
+            rows, column = rows[best], column[best]
+        order = np.lexsort((rows, -column))
+        return {self.names[rows[i]]: column[i].item() for i in order}
+
+    def metric_stats(self):
+        """
+        Summarises every score type of the table over the parts that have it.
+        Returns:
+            dict: A dictionary mapping score types to a dict with the number of parts that have
+                the score ("count") and its "min", "median" and "max" values.
+        """
+
+        stats = {}
+        for col, metric in enumerate(self.metrics):
+            column = self.values[self.mask[:, col], col]
+            if not len(column):
+                continue
+            stats[metric] = {
+                "count": len(column),
+                "min": column.min().item(),
+                "median": float(np.median(column)),
+                "max": column.max().item(),
+            }
+        return stats
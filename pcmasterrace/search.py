@@ -0,0 +1,99 @@
+import re
+from bisect import bisect_left
+
+
+def normalize(s):
+    """Lowercase a name and drop everything that is not a letter or digit."""
+    return re.sub(r"[\W_]+", "", s).lower()
+
+
+def tokenize(s):
+    """Split a lowercased name into its word-character runs, e.g. "i7-12700k" -> ["i7", "12700k"]."""
+    return re.findall(r"\w+", s.lower())
+
+
+class PartIndex:
+    """
+    Search index over part names, answering the four match tiers of `PCMasterRace.regex_match`.
+    Every tier returns all matches in the original candidate order, exactly like a linear scan would:
+    1. Exact lowercase name -> names dict.
+    2. Normalized name -> names dict.
+    3. Whole-word match: an inverted index from tokens to names narrows the candidates, which are
+       then confirmed with the same word-boundary regex. Every token of a whole-word match must be
+       a complete token of the candidate, so intersecting the token postings loses no match.
+    4. Substring match: names containing the query are found by prefix search over a sorted array of
+       all name suffixes; names contained in the query are found by looking up each of its substrings.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self._lower = [name.lower() for name in self.names]
+        self._exact = {}
+        self._normalized = {}
+        self._tokens = {}
+        for idx, (name, lower) in enumerate(zip(self.names, self._lower)):
+            self._exact.setdefault(lower, []).append(idx)
+            self._normalized.setdefault(normalize(name), []).append(idx)
+            for token in set(tokenize(lower)):
+                self._tokens.setdefault(token, []).append(idx)
+
+        suffixes = sorted(
+            (lower[start:], idx)
+            for idx, lower in enumerate(self._lower)
+            for start in range(len(lower))
+        )
+        self._suffixes = [suffix for suffix, _ in suffixes]
+        self._suffix_owner = [idx for _, idx in suffixes]
+        self._max_len = max(map(len, self._lower), default=0)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name.lower() in self._exact
+
+    def _resolve(self, indices):
+        return [self.names[idx] for idx in sorted(set(indices))]
+
+    def match(self, name):
+        """
+        Return every candidate matching `name` in the first tier that matches anything, in
+        candidate order, or an empty list.
+        """
+        lower = name.lower()
+
+        # 1. Case-insensitive exact match
+        if lower in self._exact:
+            return self._resolve(self._exact[lower])
+
+        # 2. Normalized (alphanumeric, no spaces) match
+        hits = self._normalized.get(normalize(name))
+        if hits:
+            return self._resolve(hits)
+
+        # 3. Regex: match as a whole word or model code
+        pattern = re.compile(rf"\b{re.escape(name)}\b", re.IGNORECASE)
+        tokens = tokenize(lower)
+        if tokens:
+            postings = [self._tokens.get(token, ()) for token in set(tokens)]
+            candidates = set(min(postings, key=len)).intersection(*postings)
+        else:
+            candidates = range(len(self.names))
+        hits = [idx for idx in candidates if pattern.search(self.names[idx])]
+        if hits:
+            return self._resolve(hits)
+
+        # 4. Substring match (in either direction)
+        hits = []
+        start = bisect_left(self._suffixes, lower)
+        for pos in range(start, len(self._suffixes)):
+            if not self._suffixes[pos].startswith(lower):
+                break
+            hits.append(self._suffix_owner[pos])
+        for begin in range(len(lower) + 1):
+            for end in range(begin, min(len(lower), begin + self._max_len) + 1):
+                hits.extend(self._exact.get(lower[begin:end], ()))
+        return self._resolve(hits)